@@ -23,14 +23,14 @@ from pathlib import Path
 # Add hooks directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from utils.local_memory import LocalMemory
+from utils import get_local_memory, jsonio
 
 
 def main():
     """Log tool usage to session log."""
     # Read tool call info from stdin
     try:
-        input_data = json.load(sys.stdin)
+        input_data = jsonio.load_stdin()
     except (json.JSONDecodeError, IOError):
         return
 
@@ -43,7 +43,7 @@ def main():
 
     # Initialize local memory
     try:
-        local = LocalMemory()
+        local = get_local_memory()
         local.initialize()  # Ensure .memory dir exists
     except Exception as e:
         print(f"<!-- Failed to initialize local memory: {e} -->", file=sys.stderr)
@@ -15,6 +15,11 @@ import json
 import re
 import sys
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 
 # Commands that are always allowed without prompting
 ALLOW_PATTERNS = [
@@ -44,10 +49,14 @@ BLOCK_PATTERNS = [
     r'>\s*/dev/sda',
 ]
 
+# Fused into single alternations so each check is one regex scan
+_ALLOW_RE = re.compile("|".join(f"(?:{p})" for p in ALLOW_PATTERNS), re.IGNORECASE)
+_BLOCK_RE = re.compile("|".join(f"(?:{p})" for p in BLOCK_PATTERNS), re.IGNORECASE)
+
 
 def main():
     try:
-        hook_data = json.load(sys.stdin)
+        hook_data = json_loads(sys.stdin.buffer.read())
     except (json.JSONDecodeError, IOError):
         sys.exit(0)  # Allow on parse error
 
@@ -61,15 +70,13 @@ def main():
         sys.exit(0)
 
     # Check block patterns first
-    for pattern in BLOCK_PATTERNS:
-        if re.search(pattern, command, re.IGNORECASE):
-            print(f"Blocked: {command[:100]}", file=sys.stderr)
-            sys.exit(2)
+    if _BLOCK_RE.search(command):
+        print(f"Blocked: {command[:100]}", file=sys.stderr)
+        sys.exit(2)
 
     # Check allow patterns - skip prompt for safe read-only commands
-    for pattern in ALLOW_PATTERNS:
-        if re.search(pattern, command, re.IGNORECASE):
-            sys.exit(0)
+    if _ALLOW_RE.search(command):
+        sys.exit(0)
 
     # Everything else: prompt user for confirmation
     desc = hook_data.get("tool_input", {}).get("description", "")
@@ -14,77 +14,103 @@ Output:
 
 import json
 import os
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add hooks directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from utils.letta_client import LettaClient
-from utils.local_memory import LocalMemory
+from utils import get_letta_client, get_local_memory, jsonio
 
 
-def extract_keywords(text: str) -> list[str]:
+# Common words that make poor search terms
+STOPWORDS = frozenset({
+    "the", "and", "for", "that", "this", "with", "from", "have", "been",
+    "will", "would", "could", "should", "what", "when", "where", "which",
+    "there", "their", "about", "into", "more", "some", "only", "just",
+    "also", "than", "then", "them", "these", "those", "being", "does",
+    "please", "want", "need", "help", "make", "like", "know", "think",
+})
+
+# Prompts below either threshold skip the memory searches entirely
+MIN_PROMPT_LENGTH = 20
+MIN_KEYWORDS = 2
+
+# Words > 3 chars
+_WORD_RE = re.compile(r"\w{4,}")
+
+
+def extract_keywords(text: str, limit: int = 5) -> list[str]:
     """Extract meaningful keywords from text for search."""
-    # Simple keyword extraction: words > 3 chars, excluding common words
-    stopwords = {
-        "the", "and", "for", "that", "this", "with", "from", "have", "been",
-        "will", "would", "could", "should", "what", "when", "where", "which",
-        "there", "their", "about", "into", "more", "some", "only", "just",
-        "also", "than", "then", "them", "these", "those", "being", "does",
-        "please", "want", "need", "help", "make", "like", "know", "think",
-    }
+    # Stops scanning once the limit is reached, so long pasted logs are cheap
+    keywords = []
+    for match in _WORD_RE.finditer(text):
+        word = match.group().lower()
+        if word not in STOPWORDS:
+            keywords.append(word)
+            if len(keywords) >= limit:
+                break
+    return keywords
+
+
+def search_global(query: str) -> list[dict]:
+    """Search Letta archival memory. Returns [] if Letta is unavailable."""
+    try:
+        letta = get_letta_client()
+        archival = letta.search_archival(query, limit=3)
+        return [
+            {"source": "global", "text": memory.get("text", "")}
+            for memory in archival
+        ]
+    except Exception:
+        return []  # Continue without Letta if unavailable
+
 
-    words = text.lower().split()
-    keywords = [w for w in words if len(w) > 3 and w not in stopwords]
-    return keywords[:5]  # Limit to 5 keywords
+def search_project(query: str) -> list[dict]:
+    """Search local project memories. Returns [] if none are available."""
+    try:
+        local = get_local_memory()
+        if not local.exists:
+            return []
+        return [
+            {
+                "source": "project",
+                "text": f"[{memory['category']}] {memory['title']}: {memory['content'][:200]}",
+            }
+            for memory in local.search(query)[:3]
+        ]
+    except Exception:
+        return []
 
 
 def main():
     """Search memories and output relevant context."""
     # Read prompt from stdin
     try:
-        input_data = json.load(sys.stdin)
+        input_data = jsonio.load_stdin()
         prompt = input_data.get("prompt", "")
     except (json.JSONDecodeError, IOError):
         # No input or invalid JSON - nothing to do
         return
 
-    if not prompt:
+    # Short acknowledgements ("ok thanks") never yield useful matches
+    if len(prompt) < MIN_PROMPT_LENGTH:
         return
 
     # Extract keywords for search
     keywords = extract_keywords(prompt)
-    if not keywords:
+    if len(keywords) < MIN_KEYWORDS:
         return
 
     query = " ".join(keywords)
-    results = []
-
-    # Search Letta Cloud
-    try:
-        letta = LettaClient()
-        archival = letta.search_archival(query, limit=3)
-        for memory in archival:
-            results.append({
-                "source": "global",
-                "text": memory.get("text", ""),
-            })
-    except Exception:
-        pass  # Continue without Letta if unavailable
 
-    # Search local memories
-    try:
-        local = LocalMemory()
-        if local.exists:
-            local_results = local.search(query)
-            for memory in local_results[:3]:
-                results.append({
-                    "source": "project",
-                    "text": f"[{memory['category']}] {memory['title']}: {memory['content'][:200]}",
-                })
-    except Exception:
-        pass
+    # Letta (network) and local (disk) searches are independent; run them together
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        global_future = executor.submit(search_global, query)
+        project_future = executor.submit(search_project, query)
+        results = global_future.result() + project_future.result()
 
     # Output relevant context
     if results:
@@ -12,13 +12,14 @@ Output:
 import json
 import os
 import sys
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
 
 # Add hooks directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from utils.local_memory import LocalMemory
+from utils import get_local_memory
 
 
 def main():
@@ -27,21 +28,20 @@ def main():
     session_summary = []
 
     try:
-        local = LocalMemory()
+        local = get_local_memory()
         if local.exists:
-            events = local.load_session_log()
-            if events:
-                # Summarize session activity
-                edit_count = sum(1 for e in events if e.get("type") == "edit")
-                write_count = sum(1 for e in events if e.get("type") == "write")
-                bash_count = sum(1 for e in events if e.get("type") == "bash")
-
-                files_modified = set()
-                for e in events:
-                    if e.get("file"):
-                        files_modified.add(e["file"])
-
-                session_summary.append(f"Session activity: {edit_count} edits, {write_count} writes, {bash_count} commands")
+            # Summarize session activity in one pass over the log
+            types = Counter()
+            files_modified = set()
+            for e in local.iter_session_log():
+                types[e.get("type")] += 1
+                if e.get("file"):
+                    files_modified.add(e["file"])
+
+            if types:
+                session_summary.append(
+                    f"Session activity: {types['edit']} edits, {types['write']} writes, {types['bash']} commands"
+                )
                 if files_modified:
                     session_summary.append(f"Files modified: {', '.join(sorted(files_modified)[:10])}")
     except Exception:
@@ -16,21 +16,57 @@ Output:
 import json
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add hooks directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from utils.letta_client import LettaClient
-from utils.local_memory import LocalMemory
-from utils.dedup import is_duplicate
+from utils import LettaClient, LocalMemory, get_letta_client, get_local_memory, jsonio
+from utils.dedup import DedupIndex
+
+# Seconds a cached snapshot of global memories is trusted for dedup
+# before refetching from Letta
+GLOBAL_CACHE_MAX_AGE = 3600
+
+
+def load_existing_local(local: LocalMemory) -> list[str]:
+    """Ensure .memory/ exists and return the content of every local memory."""
+    local.initialize()
+    return [
+        m.get("content", "")
+        for cat_memories in local.load_all().values()
+        for m in cat_memories
+    ]
+
+
+def load_existing_global() -> tuple[LettaClient, dict, bool]:
+    """
+    Connect to Letta and get the snapshot of global memories to dedup against.
+
+    A recent cached snapshot is reused instead of fetching from Letta.
+
+    Returns:
+        (client, snapshot, whether the snapshot was freshly fetched)
+    """
+    letta = get_letta_client()
+    cached = letta.load_archival_cache(GLOBAL_CACHE_MAX_AGE)
+    if cached is not None:
+        return letta, cached, False
+    archival = letta.list_archival(limit=100)
+    snapshot = {
+        "fetched_at": time.time(),
+        "texts": [m.get("text", "") for m in archival],
+    }
+    return letta, snapshot, True
 
 
 def main():
     """Save extracted memories to appropriate storage."""
     # Read memories from stdin
     try:
-        input_data = json.load(sys.stdin)
+        input_data = jsonio.load_stdin()
     except (json.JSONDecodeError, IOError):
         print("<!-- No memory data received -->", file=sys.stderr)
         return
@@ -47,26 +83,46 @@ def main():
     # Initialize clients
     letta = None
     local = None
-    existing_global = []
-    existing_local = []
+    existing_global = DedupIndex(threshold=0.85)
+    existing_local = DedupIndex(threshold=0.85)
+    global_cache = None
+    global_cache_dirty = False
+
+    # Only load the tiers that incoming memories will be saved to
+    tiers = {m.get("tier", "").lower() for m in memories}
+    needs_local = "project" in tiers
+    needs_global = "global" in tiers
+
+    if needs_local:
+        try:
+            local = get_local_memory()
+        except Exception as e:
+            print(f"<!-- Local memory error: {e} -->", file=sys.stderr)
+
+    # The .memory/ scan and the Letta fetch are independent; overlap them
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        local_future = executor.submit(load_existing_local, local) if local else None
+        global_future = executor.submit(load_existing_global) if needs_global else None
+
+        if local_future:
+            try:
+                for text in local_future.result():
+                    existing_local.add(text)
+            except Exception as e:
+                print(f"<!-- Local memory error: {e} -->", file=sys.stderr)
 
-    try:
-        letta = LettaClient()
-        # Load existing for dedup
-        archival = letta.list_archival(limit=100)
-        existing_global = [m.get("text", "") for m in archival]
-    except Exception as e:
-        print(f"<!-- Letta unavailable: {e} -->", file=sys.stderr)
+        if global_future:
+            try:
+                letta, global_cache, fetched = global_future.result()
+                # list_archival returns [] on failure, so never pin an empty snapshot
+                global_cache_dirty = fetched and bool(global_cache["texts"])
+                for text in global_cache["texts"]:
+                    existing_global.add(text)
+            except Exception as e:
+                print(f"<!-- Letta unavailable: {e} -->", file=sys.stderr)
 
-    try:
-        local = LocalMemory()
-        local.initialize()
-        all_local = local.load_all()
-        for cat_memories in all_local.values():
-            for m in cat_memories:
-                existing_local.append(m.get("content", ""))
-    except Exception as e:
-        print(f"<!-- Local memory error: {e} -->", file=sys.stderr)
+    # Global memories are inserted together after the loop
+    pending_global = []
 
     # Process each memory
     for memory in memories:
@@ -93,16 +149,13 @@ def main():
                 continue
 
             # Check for duplicates
-            if is_duplicate(full_text, existing_global, threshold=0.85):
+            if existing_global.find_duplicate(full_text):
                 skipped_dupes += 1
                 continue
 
-            try:
-                letta.insert_archival(full_text)
-                existing_global.append(full_text)
-                saved_global += 1
-            except Exception as e:
-                print(f"<!-- Failed to save global memory: {e} -->", file=sys.stderr)
+            # Queued for one batched insert; later candidates dedup against it
+            existing_global.add(full_text)
+            pending_global.append(full_text)
 
         elif tier == "project":
             # Save to local .memory/
@@ -110,16 +163,16 @@ def main():
                 continue
 
             # Check for duplicates
-            if is_duplicate(content, existing_local, threshold=0.85):
+            if existing_local.find_duplicate(content):
                 skipped_dupes += 1
                 continue
 
             try:
                 # Use first line as title, or truncate content
-                lines = content.split("\n")
-                if len(lines) > 1 and len(lines[0]) < 100:
-                    title = lines[0]
-                    body = "\n".join(lines[1:]).strip()
+                first_line, newline, rest = content.partition("\n")
+                if newline and len(first_line) < 100:
+                    title = first_line
+                    body = rest.strip()
                 else:
                     title = content[:60] + "..." if len(content) > 60 else content
                     body = content
@@ -128,11 +181,32 @@ def main():
                     body = f"{body}\n\n**Why this matters:** {reason}"
 
                 local.save_memory(category, title, body)
-                existing_local.append(content)
+                existing_local.add(content)
                 saved_project += 1
             except Exception as e:
                 print(f"<!-- Failed to save project memory: {e} -->", file=sys.stderr)
 
+    if pending_global:
+        try:
+            memory_ids = letta.insert_archival_batch(pending_global)
+        except Exception as e:
+            print(f"<!-- Failed to save global memories: {e} -->", file=sys.stderr)
+            memory_ids = []
+        for full_text, memory_id in zip(pending_global, memory_ids):
+            if not memory_id:
+                continue
+            saved_global += 1
+            # Keep the snapshot current (an empty one is never cached)
+            if global_cache and global_cache["texts"]:
+                global_cache["texts"].append(full_text)
+                global_cache_dirty = True
+
+    if global_cache_dirty:
+        try:
+            letta.save_archival_cache(global_cache["texts"], global_cache["fetched_at"])
+        except Exception as e:
+            print(f"<!-- Failed to cache global memories: {e} -->", file=sys.stderr)
+
     # Output summary
     print(f"<memory-save-summary>")
     print(f"Saved {saved_global} global memories to Letta Cloud")
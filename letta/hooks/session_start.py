@@ -12,53 +12,61 @@ Output:
 import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add hooks directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from utils.letta_client import LettaClient
-from utils.local_memory import LocalMemory
+from utils import get_letta_client, get_local_memory
+
+
+def load_local_summary() -> str:
+    """Get the local project memory summary, or "" if unavailable."""
+    try:
+        local = get_local_memory()
+        if local.exists:
+            return local.get_context_summary()
+    except Exception as e:
+        print(f"<!-- Local memory error: {e} -->", file=sys.stderr)
+    return ""
 
 
 def main():
     """Load memories and output context for session injection."""
     output_parts = []
 
-    # Load Letta Cloud memories (global)
-    try:
-        letta = LettaClient()
-
-        # Get core memory
-        core = letta.get_core_memory()
-        if core:
-            output_parts.append("## Global Context (Letta)")
-            if core.get("persona"):
-                output_parts.append(f"**Persona**: {core['persona']}")
-            if core.get("human"):
-                output_parts.append(f"**User**: {core['human']}")
-
-        # Get recent archival memories (most relevant patterns/learnings)
-        archival = letta.list_archival(limit=10)
-        if archival:
-            output_parts.append("\n### Recent Learnings")
-            for memory in archival[:5]:
-                text = memory.get("text", "")[:200]
-                output_parts.append(f"- {text}")
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        # Local summary is disk-only; start it before connecting to Letta
+        local_future = executor.submit(load_local_summary)
 
-    except Exception as e:
-        # Don't fail the session if Letta is unavailable
-        print(f"<!-- Letta unavailable: {e} -->", file=sys.stderr)
+        # Load Letta Cloud memories (global)
+        try:
+            letta = get_letta_client()
+            core_future = executor.submit(letta.get_core_memory)
+            # Recent archival memories (most relevant patterns/learnings)
+            archival_future = executor.submit(letta.list_archival, limit=10)
 
-    # Load local project memories
-    try:
-        local = LocalMemory()
-        if local.exists:
-            summary = local.get_context_summary()
-            if summary:
-                output_parts.append(f"\n{summary}")
-    except Exception as e:
-        print(f"<!-- Local memory error: {e} -->", file=sys.stderr)
+            core = core_future.result()
+            if core:
+                output_parts.append("## Global Context (Letta)")
+                if core.get("persona"):
+                    output_parts.append(f"**Persona**: {core['persona']}")
+                if core.get("human"):
+                    output_parts.append(f"**User**: {core['human']}")
+
+            archival = archival_future.result()
+            if archival:
+                output_parts.append("\n### Recent Learnings")
+                output_parts.append("\n".join(f"- {m.get('text', '')[:200]}" for m in archival[:5]))
+
+        except Exception as e:
+            # Don't fail the session if Letta is unavailable
+            print(f"<!-- Letta unavailable: {e} -->", file=sys.stderr)
+
+        summary = local_future.result()
+        if summary:
+            output_parts.append(f"\n{summary}")
 
     # Output combined context
     if output_parts:
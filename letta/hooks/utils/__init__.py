@@ -1,13 +1,30 @@
 """Utility modules for Letta hooks."""
 
+from functools import lru_cache
+
 from .letta_client import LettaClient
 from .local_memory import LocalMemory
 from .dedup import deduplicate_memories
 from .file_manager import FileManager, Section, LineRange, read_section, write_section, list_sections, str_replace
 
+
+@lru_cache(maxsize=1)
+def get_letta_client() -> LettaClient:
+    """Get the process-wide LettaClient, creating it on first use."""
+    return LettaClient()
+
+
+@lru_cache(maxsize=1)
+def get_local_memory() -> LocalMemory:
+    """Get the process-wide LocalMemory for the current directory, creating it on first use."""
+    return LocalMemory()
+
+
 __all__ = [
     "LettaClient",
     "LocalMemory",
+    "get_letta_client",
+    "get_local_memory",
     "deduplicate_memories",
     "FileManager",
     "Section",
@@ -4,8 +4,16 @@ Memory deduplication utilities.
 Uses simple similarity matching to avoid storing duplicate memories.
 """
 
+import heapq
 import re
-from typing import Optional
+from functools import lru_cache
+from typing import Iterable, Optional
+
+_PUNCT_RE = re.compile(r"[^\w\s]")
+# Same character class as _PUNCT_RE, restricted to ASCII, for str.translate
+_ASCII_PUNCT_TABLE = str.maketrans("", "", "".join(
+    c for c in map(chr, range(128)) if _PUNCT_RE.match(c)
+))
 
 
 def normalize_text(text: str) -> str:
@@ -24,9 +32,35 @@ def normalize_text(text: str) -> str:
         Normalized text
     """
     text = text.lower()
-    text = re.sub(r"\s+", " ", text)
-    text = re.sub(r"[^\w\s]", "", text)
-    return text.strip()
+    if text.isascii():
+        text = text.translate(_ASCII_PUNCT_TABLE)
+    else:
+        text = _PUNCT_RE.sub("", text)
+    return " ".join(text.split())
+
+
+@lru_cache(maxsize=4096)
+def token_set(text: str) -> frozenset[str]:
+    """
+    Get the set of normalized words in a text.
+
+    Cached, since the same existing memories are compared repeatedly.
+
+    Args:
+        text: Input text
+
+    Returns:
+        Frozen set of normalized words
+    """
+    return frozenset(normalize_text(text).split())
+
+
+def _jaccard_sets(words1: frozenset[str], words2: frozenset[str]) -> float:
+    """Jaccard similarity of two precomputed word sets."""
+    if not words1 or not words2:
+        return 0.0
+    intersection = len(words1 & words2)
+    return intersection / (len(words1) + len(words2) - intersection)
 
 
 def jaccard_similarity(text1: str, text2: str) -> float:
@@ -40,16 +74,86 @@ def jaccard_similarity(text1: str, text2: str) -> float:
     Returns:
         Similarity score between 0 and 1
     """
-    words1 = set(normalize_text(text1).split())
-    words2 = set(normalize_text(text2).split())
+    return _jaccard_sets(token_set(text1), token_set(text2))
 
-    if not words1 or not words2:
-        return 0.0
 
-    intersection = words1 & words2
-    union = words1 | words2
+class DedupIndex:
+    """
+    Index of existing texts for repeated duplicate checks.
 
-    return len(intersection) / len(union)
+    Each text is normalized once when added. Texts with exactly the same
+    word set are found with one hash lookup; otherwise an inverted word index
+    limits Jaccard comparisons to texts sharing at least one word with the
+    query, and a set-size bound skips texts that cannot reach the threshold.
+    """
+
+    def __init__(self, texts: Iterable[str] = (), threshold: float = 0.85):
+        """
+        Initialize the index.
+
+        Args:
+            texts: Existing texts to index
+            threshold: Similarity threshold (0-1). Default 0.85.
+        """
+        self._threshold = threshold
+        self._texts: list[str] = []
+        self._word_sets: list[frozenset[str]] = []
+        self._postings: dict[str, list[int]] = {}
+        self._exact: dict[frozenset[str], int] = {}
+        for text in texts:
+            self.add(text)
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def add(self, text: str) -> None:
+        """
+        Add a text to the index.
+
+        Args:
+            text: Text to add
+        """
+        words = token_set(text)
+        idx = len(self._texts)
+        self._texts.append(text)
+        self._word_sets.append(words)
+        self._exact.setdefault(words, idx)
+        for word in words:
+            self._postings.setdefault(word, []).append(idx)
+
+    def find_duplicate(self, text: str) -> Optional[str]:
+        """
+        Find an indexed text that duplicates the given text.
+
+        Args:
+            text: Text to check
+
+        Returns:
+            A matching text if duplicate (the earliest-added one with the
+            same words, else the earliest-added similar one), None otherwise
+        """
+        words = token_set(text)
+        if not words:
+            return None
+
+        # Identical word sets always have similarity 1
+        exact = self._exact.get(words)
+        if exact is not None and self._threshold <= 1.0:
+            return self._texts[exact]
+
+        candidates = set()
+        for word in words:
+            candidates.update(self._postings.get(word, ()))
+
+        size = len(words)
+        for idx in sorted(candidates):
+            other = self._word_sets[idx]
+            # Jaccard can never exceed min(|A|, |B|) / max(|A|, |B|)
+            if min(size, len(other)) < self._threshold * max(size, len(other)):
+                continue
+            if _jaccard_sets(words, other) >= self._threshold:
+                return self._texts[idx]
+        return None
 
 
 def is_duplicate(
@@ -68,9 +172,9 @@ def is_duplicate(
     Returns:
         The matching existing text if duplicate, None otherwise
     """
+    words = token_set(new_text)
     for existing in existing_texts:
-        similarity = jaccard_similarity(new_text, existing)
-        if similarity >= threshold:
+        if _jaccard_sets(words, token_set(existing)) >= threshold:
             return existing
     return None
 
@@ -92,16 +196,16 @@ def deduplicate_memories(
         Deduplicated list of memories
     """
     result = []
-    seen_texts = []
+    seen = DedupIndex(threshold=threshold)
 
     for memory in memories:
         content = memory.get(content_key, "")
         if not content:
             continue
 
-        if not is_duplicate(content, seen_texts, threshold):
+        if not seen.find_duplicate(content):
             result.append(memory)
-            seen_texts.append(content)
+            seen.add(content)
 
     return result
 
@@ -125,13 +229,17 @@ def find_similar(
         List of (text, similarity_score) tuples, sorted by similarity
     """
     results = []
+    query_words = token_set(query)
+    query_size = len(query_words)
 
     for text in texts:
-        similarity = jaccard_similarity(query, text)
+        words = token_set(text)
+        # Jaccard can never exceed min(|A|, |B|) / max(|A|, |B|)
+        if min(query_size, len(words)) < threshold * max(query_size, len(words)):
+            continue
+        similarity = _jaccard_sets(query_words, words)
         if similarity >= threshold:
             results.append((text, similarity))
 
-    # Sort by similarity descending
-    results.sort(key=lambda x: x[1], reverse=True)
-
-    return results[:limit]
+    # Top matches by similarity descending (stable, like a full sort)
+    return heapq.nlargest(limit, results, key=lambda x: x[1])
@@ -4,13 +4,32 @@ Sophisticated file management utilities for reading and writing subsections.
 Provides markdown-aware section operations and precise line-based operations.
 """
 
+import os
 import re
+import stat
+import threading
+from bisect import bisect_right
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import accumulate, islice
 from pathlib import Path
 from typing import Optional
 
+# Markdown ATX heading: group 1 is the #s, group 2 the heading text. Only a
+# space or tab may follow the #s, so a match never spans lines and MULTILINE
+# lets the same pattern match one line or find every heading in a file.
+_HEADING_RE = re.compile(r'^(#{1,6})[ \t]+(.+)$', re.MULTILINE)
+# Three or more newlines, collapsed to one blank line after deletions
+_BLANK_RUN_RE = re.compile(r'\n{3,}')
 
-@dataclass
+
+@lru_cache(maxsize=128)
+def _compile(pattern: str) -> re.Pattern:
+    """Compile a find_in_file pattern, reusing earlier compilations."""
+    return re.compile(pattern)
+
+
+@dataclass(slots=True)
 class Section:
     """Represents a markdown section."""
     heading: str
@@ -20,7 +39,7 @@ class Section:
     content: str  # Content without the heading line
 
 
-@dataclass
+@dataclass(slots=True)
 class LineRange:
     """Represents a range of lines."""
     start: int  # 1-indexed, inclusive
@@ -28,6 +47,83 @@ class LineRange:
     content: str
 
 
+class _LineIndex:
+    """
+    File text together with its lines, line start offsets, and headings.
+
+    Edits splice the original text at line offsets instead of re-joining
+    every line. Line indices are 0-indexed.
+    """
+
+    __slots__ = ("text", "lines", "_starts", "_headings")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.lines = text.split('\n')
+        # _starts[i] is the offset of line i; the final entry is len(text) + 1
+        self._starts = list(accumulate((len(line) + 1 for line in self.lines), initial=0))
+        self._headings: Optional[list[tuple[int, int, str]]] = None
+
+    def join(self, start: int, end: int) -> str:
+        """Same as '\\n'.join(lines[start:end])."""
+        if start >= end:
+            return ''
+        return self.text[self._starts[start]:self._starts[end] - 1]
+
+    def splice(self, start: int, end: int, new: Optional[str]) -> str:
+        """
+        Same as '\\n'.join(lines[:start] + [new] + lines[end:]).
+
+        If new is None, lines[start:end] are removed with nothing in their place.
+        """
+        return ''.join(self.splice_parts(start, end, new))
+
+    def splice_parts(self, start: int, end: int, new: Optional[str]) -> list[str]:
+        """Pieces that concatenate to splice(start, end, new), without joining them."""
+        pieces = []
+        if start > 0:
+            pieces.append(self.join(0, start))
+        if new is not None:
+            pieces.append(new)
+        if end < len(self.lines):
+            pieces.append(self.join(end, len(self.lines)))
+        parts = []
+        for piece in pieces:
+            if parts:
+                parts.append('\n')
+            parts.append(piece)
+        return parts
+
+    def line_of(self, offset: int) -> int:
+        """Index of the line containing a text offset."""
+        return bisect_right(self._starts, offset) - 1
+
+    def headings(self) -> list[tuple[int, int, str]]:
+        """(line index, level, heading text) for every heading, parsed on first use."""
+        if self._headings is None:
+            self._headings = [
+                (self.line_of(match.start()), len(match.group(1)), match.group(2).strip())
+                for match in _HEADING_RE.finditer(self.text)
+            ]
+        return self._headings
+
+    def find(self, pattern: str) -> list[int]:
+        """
+        Indices of lines containing pattern, which must be non-empty and single-line.
+
+        Searches the whole text instead of each line, jumping to the start
+        of the next line after every hit.
+        """
+        found = []
+        text, starts = self.text, self._starts
+        pos = text.find(pattern)
+        while pos != -1:
+            i = self.line_of(pos)
+            found.append(i)
+            pos = text.find(pattern, starts[i + 1])
+        return found
+
+
 class FileManager:
     """
     File management with section-aware and line-based operations.
@@ -44,6 +140,8 @@ class FileManager:
             file_path: Path to the file to manage
         """
         self._path = Path(file_path)
+        # (mtime_ns, size) of the last read, with its line index
+        self._cache: Optional[tuple[tuple[int, int], _LineIndex]] = None
 
     @property
     def path(self) -> Path:
@@ -57,14 +155,86 @@ class FileManager:
 
     def read(self) -> str:
         """Read entire file content."""
-        if not self.exists:
-            raise FileNotFoundError(f"File not found: {self._path}")
-        return self._path.read_text()
+        return self._index().text
 
     def write(self, content: str) -> None:
         """Write entire file content."""
-        self._path.parent.mkdir(parents=True, exist_ok=True)
-        self._path.write_text(content)
+        self._write_parts([content])
+
+    def _write_parts(self, parts: list[str]) -> None:
+        """
+        Write the concatenation of parts as the entire file content.
+
+        The parts are written with one vectored write to a temporary file in
+        the same directory, which then replaces the file, so readers never
+        see partial content. An existing file keeps its permissions.
+        """
+        target = Path(os.path.realpath(self._path))
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # Unique per thread, so concurrent writers never share a temporary file
+        tmp = target.with_name(f'.{target.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        chunks = [memoryview(part.encode('utf-8')) for part in parts if part]
+        try:
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+            try:
+                try:
+                    os.fchmod(fd, stat.S_IMODE(os.stat(target).st_mode))
+                except FileNotFoundError:
+                    pass
+                while chunks:
+                    written = os.writev(fd, chunks)
+                    # Drop what a short write consumed and continue with the rest
+                    while chunks and written >= len(chunks[0]):
+                        written -= len(chunks.pop(0))
+                    if written:
+                        chunks[0] = chunks[0][written:]
+            finally:
+                os.close(fd)
+            os.replace(tmp, target)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except FileNotFoundError:
+                pass
+            raise
+        finally:
+            self._cache = None
+
+    def _index(self) -> _LineIndex:
+        """Load the file's line index, raising FileNotFoundError if it does not exist."""
+        index = self._try_index()
+        if index is None:
+            raise FileNotFoundError(f"File not found: {self._path}")
+        return index
+
+    def _try_index(self) -> Optional[_LineIndex]:
+        """
+        Load the file's line index, or None if it does not exist.
+
+        The previous read is reused while the file's mtime and size match, so
+        an unchanged file costs one stat() per operation.
+        """
+        try:
+            st = self._path.stat()
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+
+        key = (st.st_mtime_ns, st.st_size)
+        if self._cache is None or self._cache[0] != key:
+            self._cache = (key, _LineIndex(self._read_text()))
+        return self._cache[1]
+
+    def _read_text(self) -> str:
+        """
+        Read and decode the file, translating CRLF and CR line endings to LF.
+
+        Matches read_text()'s universal newlines, but only pays for the
+        translation when the file actually contains a carriage return.
+        """
+        text = self._path.read_bytes().decode('utf-8')
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return text
 
     # =========================================================================
     # Section-based operations (markdown-aware)
@@ -77,34 +247,18 @@ class FileManager:
         Returns:
             List of Section objects with heading, level, line range, and content
         """
-        if not self.exists:
+        index = self._try_index()
+        if index is None:
             return []
 
-        lines = self.read().split('\n')
+        headings = index.headings()
         sections = []
-        heading_pattern = re.compile(r'^(#{1,6})\s+(.+)$')
-
-        # Find all headings with their positions
-        headings = []
-        for i, line in enumerate(lines):
-            match = heading_pattern.match(line)
-            if match:
-                level = len(match.group(1))
-                heading = match.group(2).strip()
-                headings.append((i, level, heading))
-
-        # Build sections with content
-        for idx, (line_num, level, heading) in enumerate(headings):
-            # Find end: next heading of same or higher level, or EOF
-            if idx + 1 < len(headings):
-                end_line = headings[idx + 1][0] - 1
-            else:
-                end_line = len(lines) - 1
 
+        # Each section ends just before the next heading, or at EOF
+        ends = [line_num - 1 for line_num, _, _ in headings[1:]] + [len(index.lines) - 1]
+        for (line_num, level, heading), end_line in zip(headings, ends):
             # Extract content (lines after heading until end)
-            content_lines = lines[line_num + 1:end_line + 1]
-            content = '\n'.join(content_lines).strip()
-
+            content = index.join(line_num + 1, end_line + 1).strip()
             sections.append(Section(
                 heading=heading,
                 level=level,
@@ -115,6 +269,39 @@ class FileManager:
 
         return sections
 
+    @staticmethod
+    def _locate_section(index: _LineIndex, heading: str, include_subsections: bool = True) -> Optional[tuple[int, int, int]]:
+        """
+        Locate a section using the index's parsed headings.
+
+        Args:
+            index: Line index of the file
+            heading: The heading text (without # prefix)
+            include_subsections: If True, the section runs to the next same-or-higher level heading
+
+        Returns:
+            (heading_index, end_index, level) with 0-indexed inclusive indices, or None if not found
+        """
+        headings = index.headings()
+
+        # Find the target heading
+        for pos, (target_line, target_level, text) in enumerate(headings):
+            if text == heading:
+                break
+        else:
+            return None
+
+        # Find the end line based on include_subsections
+        end_line = len(index.lines) - 1
+        for line_num, level, _ in islice(headings, pos + 1, None):
+            # With subsections, stop at the next same-or-higher level heading;
+            # otherwise stop at any heading
+            if not include_subsections or level <= target_level:
+                end_line = line_num - 1
+                break
+
+        return target_line, end_line, target_level
+
     def read_section(self, heading: str, include_subsections: bool = True) -> Optional[Section]:
         """
         Read a section by its heading.
@@ -126,44 +313,17 @@ class FileManager:
         Returns:
             Section object or None if not found
         """
-        if not self.exists:
+        index = self._try_index()
+        if index is None:
             return None
 
-        lines = self.read().split('\n')
-        heading_pattern = re.compile(r'^(#{1,6})\s+(.+)$')
-
-        # Find the target heading
-        target_line = None
-        target_level = None
-        for i, line in enumerate(lines):
-            match = heading_pattern.match(line)
-            if match and match.group(2).strip() == heading:
-                target_line = i
-                target_level = len(match.group(1))
-                break
-
-        if target_line is None:
+        location = self._locate_section(index, heading, include_subsections)
+        if location is None:
             return None
-
-        # Find the end line based on include_subsections
-        end_line = len(lines) - 1
-        for i in range(target_line + 1, len(lines)):
-            match = heading_pattern.match(lines[i])
-            if match:
-                found_level = len(match.group(1))
-                if include_subsections:
-                    # Stop at next same-or-higher level heading
-                    if found_level <= target_level:
-                        end_line = i - 1
-                        break
-                else:
-                    # Stop at any heading
-                    end_line = i - 1
-                    break
+        target_line, end_line, target_level = location
 
         # Extract content
-        content_lines = lines[target_line + 1:end_line + 1]
-        content = '\n'.join(content_lines).strip()
+        content = index.join(target_line + 1, end_line + 1).strip()
 
         return Section(
             heading=heading,
@@ -186,27 +346,22 @@ class FileManager:
         Returns:
             True if section was written, False if not found and create_if_missing=False
         """
-        section = self.read_section(heading)
+        index = self._try_index()
+        location = self._locate_section(index, heading) if index else None
 
-        if section is None:
+        if location is None:
             if not create_if_missing:
                 return False
             # Append new section at end
-            current = self.read() if self.exists else ''
+            current = index.text if index else ''
             new_section = f"\n\n{'#' * level} {heading}\n\n{content}"
             self.write(current.rstrip() + new_section)
             return True
 
-        lines = self.read().split('\n')
+        target_line, end_line, _ = location
 
-        # Build new content
-        new_lines = (
-            lines[:section.start_line] +  # Everything before section content
-            [content] +  # New content
-            lines[section.end_line:]  # Everything after section
-        )
-
-        self.write('\n'.join(new_lines))
+        # Keep the heading and everything after the section, replace the content
+        self._write_parts(index.splice_parts(target_line + 1, end_line + 1, content))
         return True
 
     def append_to_section(self, heading: str, content: str) -> bool:
@@ -220,12 +375,20 @@ class FileManager:
         Returns:
             True if content was appended, False if section not found
         """
-        section = self.read_section(heading)
-        if section is None:
+        index = self._try_index()
+        if index is None:
             return False
 
-        new_content = section.content + '\n' + content if section.content else content
-        return self.write_section(heading, new_content)
+        location = self._locate_section(index, heading)
+        if location is None:
+            return False
+        target_line, end_line, _ = location
+
+        existing = index.join(target_line + 1, end_line + 1).strip()
+        new_content = existing + '\n' + content if existing else content
+
+        self._write_parts(index.splice_parts(target_line + 1, end_line + 1, new_content))
+        return True
 
     def insert_section(self, new_heading: str, content: str, after_heading: Optional[str] = None, level: int = 2) -> bool:
         """
@@ -242,23 +405,22 @@ class FileManager:
         """
         new_section_text = f"{'#' * level} {new_heading}\n\n{content}"
 
+        index = self._try_index()
         if after_heading is None:
-            current = self.read() if self.exists else ''
+            current = index.text if index else ''
             self.write(current.rstrip() + '\n\n' + new_section_text)
             return True
 
-        section = self.read_section(after_heading)
-        if section is None:
+        if index is None:
             return False
 
-        lines = self.read().split('\n')
-        new_lines = (
-            lines[:section.end_line] +
-            ['', new_section_text] +
-            lines[section.end_line:]
-        )
+        location = self._locate_section(index, after_heading)
+        if location is None:
+            return False
+        _, end_line, _ = location
 
-        self.write('\n'.join(new_lines))
+        # Blank line, then the new section, right after the existing one
+        self._write_parts(index.splice_parts(end_line + 1, end_line + 1, '\n' + new_section_text))
         return True
 
     def delete_section(self, heading: str) -> bool:
@@ -271,18 +433,20 @@ class FileManager:
         Returns:
             True if section was deleted, False if not found
         """
-        section = self.read_section(heading)
-        if section is None:
+        index = self._try_index()
+        if index is None:
             return False
 
-        lines = self.read().split('\n')
+        location = self._locate_section(index, heading)
+        if location is None:
+            return False
+        target_line, end_line, _ = location
 
         # Remove from heading line through end of content
-        new_lines = lines[:section.start_line - 1] + lines[section.end_line:]
+        content = index.splice(target_line, end_line + 1, None)
 
         # Clean up extra blank lines
-        content = '\n'.join(new_lines)
-        content = re.sub(r'\n{3,}', '\n\n', content)
+        content = _BLANK_RUN_RE.sub('\n\n', content)
 
         self.write(content.strip() + '\n')
         return True
@@ -302,11 +466,12 @@ class FileManager:
         Returns:
             LineRange object with the content
         """
-        if not self.exists:
-            raise FileNotFoundError(f"File not found: {self._path}")
+        return self._line_range(self._index(), start, end or start)
 
-        lines = self.read().split('\n')
-        end = end or start
+    @staticmethod
+    def _line_range(index: _LineIndex, start: int, end: int) -> LineRange:
+        """Validate a 1-indexed inclusive line range and read it from the index."""
+        lines = index.lines
 
         if start < 1 or end < 1:
             raise ValueError("Line numbers must be >= 1")
@@ -316,7 +481,7 @@ class FileManager:
             raise ValueError("Start line must be <= end line")
 
         # Convert to 0-indexed
-        content = '\n'.join(lines[start - 1:end])
+        content = index.join(start - 1, end)
 
         return LineRange(start=start, end=end, content=content)
 
@@ -328,21 +493,19 @@ class FileManager:
             after_line: Insert after this line (0 = at beginning)
             content: Content to insert (can be multi-line)
         """
-        if not self.exists:
+        index = self._try_index()
+        if index is None:
             if after_line == 0:
                 self.write(content)
                 return
             raise FileNotFoundError(f"File not found: {self._path}")
 
-        lines = self.read().split('\n')
+        line_count = len(index.lines)
 
-        if after_line < 0 or after_line > len(lines):
-            raise ValueError(f"Line number out of range (file has {len(lines)} lines)")
-
-        new_content_lines = content.split('\n')
-        new_lines = lines[:after_line] + new_content_lines + lines[after_line:]
+        if after_line < 0 or after_line > line_count:
+            raise ValueError(f"Line number out of range (file has {line_count} lines)")
 
-        self.write('\n'.join(new_lines))
+        self._write_parts(index.splice_parts(after_line, after_line, content))
 
     def replace_lines(self, start: int, end: int, content: str) -> LineRange:
         """
@@ -356,16 +519,9 @@ class FileManager:
         Returns:
             LineRange of the old content that was replaced
         """
-        if not self.exists:
-            raise FileNotFoundError(f"File not found: {self._path}")
-
-        old = self.read_lines(start, end)
-        lines = self.read().split('\n')
-
-        new_content_lines = content.split('\n')
-        new_lines = lines[:start - 1] + new_content_lines + lines[end:]
-
-        self.write('\n'.join(new_lines))
+        index = self._index()
+        old = self._line_range(index, start, end or start)
+        self._write_parts(index.splice_parts(start - 1, end, content))
         return old
 
     def delete_lines(self, start: int, end: Optional[int] = None) -> LineRange:
@@ -398,23 +554,20 @@ class FileManager:
         Returns:
             Number of replacements made
         """
-        if not self.exists:
-            raise FileNotFoundError(f"File not found: {self._path}")
-
         content = self.read()
 
-        if old_str not in content:
-            return 0
-
         if replace_all:
             count = content.count(old_str)
-            new_content = content.replace(old_str, new_str)
-        else:
-            count = 1
-            new_content = content.replace(old_str, new_str, 1)
+            if count:
+                self.write(content.replace(old_str, new_str))
+            return count
 
-        self.write(new_content)
-        return count
+        # Single replacement: splice around the first match
+        pos = content.find(old_str)
+        if pos == -1:
+            return 0
+        self._write_parts([content[:pos], new_str, content[pos + len(old_str):]])
+        return 1
 
     def find_in_file(self, pattern: str, regex: bool = False) -> list[tuple[int, str]]:
         """
@@ -427,29 +580,49 @@ class FileManager:
         Returns:
             List of (line_number, line_content) tuples for matches
         """
-        if not self.exists:
+        index = self._try_index()
+        if index is None:
             return []
 
-        lines = self.read().split('\n')
+        lines = index.lines
         matches = []
 
         if regex:
-            compiled = re.compile(pattern)
-            for i, line in enumerate(lines, 1):
-                if compiled.search(line):
-                    matches.append((i, line))
-        else:
-            for i, line in enumerate(lines, 1):
-                if pattern in line:
-                    matches.append((i, line))
+            # Matched per line: anchors and lookarounds must not see neighbouring lines
+            search = _compile(pattern).search
+            matches = [(i, line) for i, line in enumerate(lines, 1) if search(line)]
+        elif not pattern:
+            matches = list(enumerate(lines, 1))
+        elif '\n' not in pattern:
+            # A pattern spanning lines can never match within a single line
+            matches = [(i + 1, lines[i]) for i in index.find(pattern)]
 
         return matches
 
     def count_lines(self) -> int:
-        """Return total number of lines in file."""
-        if not self.exists:
+        """
+        Return total number of lines in file.
+
+        Uses the cached read when it is current; otherwise counts line breaks
+        in fixed-size chunks without loading the whole file.
+        """
+        try:
+            st = self._path.stat()
+        except (FileNotFoundError, NotADirectoryError):
             return 0
-        return len(self.read().split('\n'))
+        if self._cache is not None and self._cache[0] == (st.st_mtime_ns, st.st_size):
+            return len(self._cache[1].lines)
+
+        # One more line than line breaks, counting CRLF once as on read
+        count = 1
+        prev_cr = False
+        with open(self._path, 'rb') as f:
+            while chunk := f.read(1 << 20):
+                count += chunk.count(b'\n') + chunk.count(b'\r') - chunk.count(b'\r\n')
+                if prev_cr and chunk.startswith(b'\n'):
+                    count -= 1
+                prev_cr = chunk.endswith(b'\r')
+        return count
 
 
 def read_section(file_path: str | Path, heading: str, include_subsections: bool = True) -> Optional[Section]:
@@ -0,0 +1,58 @@
+"""
+JSON helpers for Claude Code hooks.
+
+Uses orjson when it is installed and falls back to the stdlib json module.
+Decode errors are json.JSONDecodeError in both cases.
+"""
+
+import json
+import sys
+from typing import Any
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def loads(data: str | bytes) -> Any:
+    """
+    Parse a JSON document.
+
+    Args:
+        data: JSON text as str or UTF-8 bytes
+
+    Returns:
+        Parsed Python object
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """
+    Serialize an object to compact JSON (no whitespace between tokens).
+
+    Args:
+        obj: JSON-serializable object
+
+    Returns:
+        JSON text
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def load_stdin() -> Any:
+    """
+    Parse a JSON document from stdin.
+
+    Reads the raw bytes in one call rather than through the text wrapper.
+
+    Returns:
+        Parsed Python object
+    """
+    return loads(sys.stdin.buffer.read())
@@ -5,30 +5,51 @@ Connects to the custom PostgreSQL-based memory system instead of Letta Cloud.
 Uses SSH tunnel (localhost:5433) for local development.
 """
 
+import importlib.util
 import json
 import os
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
-# Add the maintenance scripts to path for imports
+# The scaffold's maintenance scripts provide the memory system
 SCAFFOLD_PATH = Path(os.environ.get("SCAFFOLD_PATH", str(Path.home() / "scaffold" / "scripts" / "maintenance")))
-sys.path.insert(0, str(SCAFFOLD_PATH))
-
-# Try to import from the scaffold's memory system
-try:
-    from memory_database import (
-        get_db_connection,
-        get_agent_id,
-        store_memory_db,
-        search_memories_db,
-        list_memories_db,
-    )
-    DB_AVAILABLE = True
-except ImportError as e:
-    DB_AVAILABLE = False
-    IMPORT_ERROR = str(e)
+
+# memory_database module, imported by the first LettaClient
+_memory_database = None
+
+
+def _load_memory_database():
+    """
+    Import the scaffold's memory_database module on first use.
+
+    The module is loaded from its file under SCAFFOLD_PATH, so nothing
+    earlier on sys.path can shadow it. SCAFFOLD_PATH is appended to the end
+    of sys.path so that the module's own imports of sibling modules (at load
+    time or later) still resolve; at the end it is only searched for names
+    nothing else provides, instead of ahead of every import as before.
+    """
+    global _memory_database
+    if _memory_database is None:
+        module_path = SCAFFOLD_PATH / "memory_database.py"
+        if not module_path.is_file():
+            raise ImportError(f"No module named 'memory_database' at {module_path}")
+        if str(SCAFFOLD_PATH) not in sys.path:
+            sys.path.append(str(SCAFFOLD_PATH))
+        spec = importlib.util.spec_from_file_location("memory_database", module_path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["memory_database"] = module
+        try:
+            spec.loader.exec_module(module)
+        except Exception:
+            del sys.modules["memory_database"]
+            raise
+        _memory_database = module
+    return _memory_database
 
 
 class LettaClient:
@@ -40,8 +61,25 @@ class LettaClient:
     """
 
     CONFIG_FILE = Path.home() / ".claude" / "hooks" / "letta" / "config.json"
+    TUNNEL_LOCK_FILE = Path.home() / ".claude" / "hooks" / "letta" / "tunnel.lock"
+    # Per-agent snapshots of archival memory texts, kept outside project trees
+    ARCHIVAL_CACHE_DIR = Path.home() / ".claude" / "hooks" / "letta" / "cache"
+    # Shared ssh master connection; later tunnels reuse it instead of reconnecting
+    TUNNEL_CONTROL_PATH = "~/.ssh/cm-letta-%r@%h:%p"
+    TUNNEL_START_TIMEOUT = 20  # Seconds allowed for ssh to start the tunnel
     DEFAULT_PROJECT = "claude-code-scaffold"
     DEFAULT_AGENT_TYPE = "project_assistant"
+    SECRET_ID = "crucible/scaffold/rds-credentials"
+    SECRET_REGION = "us-west-1"
+    PASSWORD_TTL = 900  # Seconds a fetched secret is reused
+
+    # Secrets Manager passwords shared by all clients: secret id -> (password, fetched at)
+    _password_cache: dict[str, tuple[str, float]] = {}
+    _password_lock = threading.Lock()
+    # PGPASSWORD value exported by _get_password, as opposed to one the user set
+    _exported_password: Optional[str] = None
+    # boto3 Secrets Manager client, created on first use when boto3 is installed
+    _secrets_client = None
 
     def __init__(self, project: Optional[str] = None, agent_type: Optional[str] = None):
         """
@@ -51,21 +89,28 @@ class LettaClient:
             project: Project name (default: claude-code-scaffold)
             agent_type: Agent type (default: project_assistant)
         """
-        if not DB_AVAILABLE:
+        try:
+            self._db = _load_memory_database()
+        except ImportError as e:
             raise ImportError(
-                f"Memory database modules not available: {IMPORT_ERROR}\n"
+                f"Memory database modules not available: {e}\n"
                 f"Ensure {SCAFFOLD_PATH} exists and contains memory_database.py"
-            )
+            ) from e
 
         self._project = project or self._detect_project() or self.DEFAULT_PROJECT
         self._agent_type = agent_type or self.DEFAULT_AGENT_TYPE
         self._agent_id: Optional[str] = None
         self._conn = None
+        self._core_memory: Optional[dict] = None
 
         # Ensure SSH tunnel is running for local development
         if not os.environ.get("AWS_EXECUTION_ENV") and not os.path.exists("/.dockerenv"):
             self._ensure_tunnel()
 
+        # The memory_database helpers open their own connections and read
+        # PGPASSWORD, which _get_password exports once fetched
+        self._ensure_password()
+
     def _detect_project(self) -> Optional[str]:
         """Detect project from current working directory."""
         cwd = Path.cwd()
@@ -78,57 +123,140 @@ class LettaClient:
                 return parent.name
         return None
 
-    def _ensure_tunnel(self) -> None:
-        """Ensure SSH tunnel is running on port 5433."""
+    @staticmethod
+    def _tunnel_up() -> bool:
+        """Check whether something is listening on the tunnel port."""
         import socket
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            return sock.connect_ex(('localhost', 5433)) == 0
+
+    def _ensure_tunnel(self) -> None:
+        """
+        Ensure SSH tunnel is running on port 5433.
+
+        Concurrent hooks serialize on a lock file so only one of them starts
+        the tunnel; the others wait a bounded time for it. The tunnel runs on
+        a persistent ssh master connection (ControlMaster), so restarting it
+        does not pay for a new SSH handshake.
+        """
+        import fcntl
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            result = sock.connect_ex(('localhost', 5433))
-            sock.close()
-            if result != 0:
+            if self._tunnel_up():
+                return
+
+            self.TUNNEL_LOCK_FILE.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.TUNNEL_LOCK_FILE, "w") as lock:
+                # The holder gives up on ssh after TUNNEL_START_TIMEOUT seconds
+                deadline = time.monotonic() + self.TUNNEL_START_TIMEOUT + 5
+                while True:
+                    try:
+                        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        break
+                    except BlockingIOError:
+                        if time.monotonic() >= deadline:
+                            print("<!-- Timed out waiting for tunnel lock -->", file=sys.stderr)
+                            return
+                        time.sleep(0.1)
+
+                # Another hook may have started it while we waited
+                if self._tunnel_up():
+                    return
+
                 # Tunnel not running, try to start it
                 print("<!-- Starting SSH tunnel for database connection -->", file=sys.stderr)
+                # ControlPersist=yes keeps the master, which owns the forward,
+                # running after the last database connection closes
                 subprocess.run([
                     "ssh", "-fN",
+                    "-o", "ControlMaster=auto",
+                    "-o", f"ControlPath={self.TUNNEL_CONTROL_PATH}",
+                    "-o", "ControlPersist=yes",
                     "-L", f"5433:{os.environ.get('DB_HOST', 'localhost')}:5432",
                     "-i", os.path.expanduser(os.environ.get("SSH_KEY_PATH", "~/.ssh/id_rsa")),
                     "ec2-user@54.177.62.161"
-                ], check=False, capture_output=True)
-                import time
+                ], check=False, capture_output=True, timeout=self.TUNNEL_START_TIMEOUT)
                 time.sleep(2)
         except Exception as e:
             print(f"<!-- Tunnel check failed: {e} -->", file=sys.stderr)
 
     def _get_password(self) -> str:
-        """Get database password from AWS Secrets Manager or environment."""
-        # Check environment first
-        password = os.environ.get("PGPASSWORD") or os.environ.get("DB_PASSWORD")
+        """
+        Get database password from AWS Secrets Manager or environment.
+
+        A password fetched from Secrets Manager is cached for PASSWORD_TTL
+        seconds and exported as PGPASSWORD for the database helpers. Once it
+        expires it is fetched again, so a rotated secret is picked up.
+        """
+        # A password the user set in the environment always wins; one this
+        # class exported is handled by the cache below
+        password = os.environ.get("PGPASSWORD")
+        if password == LettaClient._exported_password:
+            password = None
+        password = password or os.environ.get("DB_PASSWORD")
         if password:
             return password
 
-        # Try AWS Secrets Manager
+        with LettaClient._password_lock:
+            entry = LettaClient._password_cache.get(self.SECRET_ID)
+            if entry and time.monotonic() - entry[1] < self.PASSWORD_TTL:
+                return entry[0]
+
+            # Try AWS Secrets Manager
+            try:
+                password = self._fetch_secret().get("password", "")
+            except Exception as e:
+                print(f"<!-- Failed to get password from Secrets Manager: {e} -->", file=sys.stderr)
+                # Keep using an expired password rather than none
+                return entry[0] if entry else ""
+
+            if password:
+                LettaClient._password_cache[self.SECRET_ID] = (password, time.monotonic())
+                LettaClient._exported_password = password
+                os.environ["PGPASSWORD"] = password
+            return password
+
+    def _ensure_password(self) -> None:
+        """
+        Resolve the password before a database call.
+
+        Skipped when the user set PGPASSWORD. Otherwise a failed fetch is
+        retried and an expired one refreshed (a cache hit costs no fetch).
+        """
+        if os.environ.get("PGPASSWORD") in (None, LettaClient._exported_password):
+            password = self._get_password()
+            # The database helpers only read PGPASSWORD, so export DB_PASSWORD too
+            if password and "PGPASSWORD" not in os.environ:
+                os.environ["PGPASSWORD"] = password
+
+    def _fetch_secret(self) -> dict:
+        """
+        Fetch the database credentials secret from AWS Secrets Manager.
+
+        Uses boto3 in-process when it is installed, otherwise the aws CLI.
+        """
         try:
+            import boto3
+        except ImportError:
             result = subprocess.run([
                 "aws", "secretsmanager", "get-secret-value",
-                "--secret-id", "crucible/scaffold/rds-credentials",
-                "--region", "us-west-1",
+                "--secret-id", self.SECRET_ID,
+                "--region", self.SECRET_REGION,
                 "--query", "SecretString",
                 "--output", "text"
             ], capture_output=True, text=True, check=True)
-            secret = json.loads(result.stdout)
-            return secret.get("password", "")
-        except Exception as e:
-            print(f"<!-- Failed to get password from Secrets Manager: {e} -->", file=sys.stderr)
-            return ""
+            return json.loads(result.stdout)
+
+        if LettaClient._secrets_client is None:
+            LettaClient._secrets_client = boto3.client("secretsmanager", region_name=self.SECRET_REGION)
+        response = LettaClient._secrets_client.get_secret_value(SecretId=self.SECRET_ID)
+        return json.loads(response["SecretString"])
 
     def _get_connection(self):
         """Get database connection, creating if needed."""
         if self._conn is None:
-            # Set password in environment for the connection
-            password = self._get_password()
-            if password:
-                os.environ["PGPASSWORD"] = password
-            self._conn = get_db_connection()
+            # The connection reads PGPASSWORD from the environment
+            self._ensure_password()
+            self._conn = self._db.get_db_connection()
         return self._conn
 
     @property
@@ -136,31 +264,39 @@ class LettaClient:
         """Get or derive agent ID."""
         if not self._agent_id:
             # get_agent_id(agent_type, project_id) returns "{agent_type}_{project_id}"
-            self._agent_id = get_agent_id(self._agent_type, self._project)
+            self._agent_id = self._db.get_agent_id(self._agent_type, self._project)
         return self._agent_id
 
     def get_core_memory(self) -> dict:
         """
         Get core memory blocks (persona, human context).
 
+        Blocks are fetched once per client; use invalidate_core() to refetch.
+
         Returns:
             Dict with persona and human keys
         """
+        if self._core_memory is not None:
+            return self._core_memory
         try:
-            # Ensure password is set
-            self._get_password()
+            self._ensure_password()
             # Query core blocks from letta_memory_blocks
-            blocks = list_memories_db(self.agent_id, limit=10, block_type="core")
+            blocks = self._db.list_memories_db(self.agent_id, limit=10, block_type="core")
             result = {}
             for block in blocks:
                 label = block.get("label", "")
                 if label in ("persona", "human", "system"):
                     result[label] = block.get("content_preview", "")
+            self._core_memory = result
             return result
         except Exception as e:
             print(f"<!-- Core memory fetch failed: {e} -->", file=sys.stderr)
             return {}
 
+    def invalidate_core(self) -> None:
+        """Drop cached core memory so the next get_core_memory refetches it."""
+        self._core_memory = None
+
     def search_archival(self, query: str, limit: int = 10) -> list[dict]:
         """
         Search archival memory using semantic search.
@@ -173,10 +309,9 @@ class LettaClient:
             List of memory dicts with text and metadata
         """
         try:
-            # Ensure password is set for the connection
-            self._get_password()
+            self._ensure_password()
             # search_memories_db creates its own connection
-            results = search_memories_db(
+            results = self._db.search_memories_db(
                 agent_id=self.agent_id,
                 query=query,
                 limit=limit
@@ -205,9 +340,8 @@ class LettaClient:
             List of memory dicts
         """
         try:
-            # Ensure password is set
-            self._get_password()
-            results = list_memories_db(self.agent_id, limit=limit, block_type="archival")
+            self._ensure_password()
+            results = self._db.list_memories_db(self.agent_id, limit=limit, block_type="archival")
             return [
                 {
                     "id": str(r.get("id", "")),
@@ -234,10 +368,9 @@ class LettaClient:
             Memory ID if successful
         """
         try:
-            # Ensure password is set for the connection
-            self._get_password()
+            self._ensure_password()
             # store_memory_db creates its own connection
-            memory_id, action = store_memory_db(
+            memory_id, action = self._db.store_memory_db(
                 agent_id=self.agent_id,
                 label=label,
                 content=text,
@@ -250,6 +383,73 @@ class LettaClient:
             print(f"<!-- Archival insert failed: {e} -->", file=sys.stderr)
             return None
 
+    def insert_archival_batch(self, texts: list[str], label: str = "learning", importance: float = 0.7) -> list[Optional[str]]:
+        """
+        Insert several memories into archival storage concurrently.
+
+        Each insert opens its own database connection, so running them on a
+        thread pool overlaps the round trips instead of paying them in sequence.
+
+        Args:
+            texts: Memory contents
+            label: Memory label/category
+            importance: Importance score (0-1)
+
+        Returns:
+            Memory ID (or None on failure) for each text, in order
+        """
+        if not texts:
+            return []
+        with ThreadPoolExecutor(max_workers=min(len(texts), 8)) as executor:
+            return list(executor.map(
+                lambda text: self.insert_archival(text, label=label, importance=importance),
+                texts,
+            ))
+
+    def load_archival_cache(self, max_age: float) -> Optional[dict]:
+        """
+        Load this agent's cached snapshot of archival memory texts.
+
+        Args:
+            max_age: Maximum age in seconds since the snapshot was fetched
+
+        Returns:
+            Dict with fetched_at and texts keys, or None if missing, stale or malformed
+        """
+        cache_path = self.ARCHIVAL_CACHE_DIR / f"{self.agent_id}.json"
+        try:
+            cache = json.loads(cache_path.read_text(encoding="utf-8"))
+            if time.time() - cache["fetched_at"] > max_age:
+                return None
+            if not isinstance(cache["texts"], list):
+                return None
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return cache
+
+    def save_archival_cache(self, texts: list[str], fetched_at: float) -> None:
+        """
+        Save a snapshot of this agent's archival memory texts for later dedup.
+
+        The file is readable only by the current user.
+
+        Args:
+            texts: Memory texts
+            fetched_at: Time the snapshot was fetched (epoch seconds)
+        """
+        self.ARCHIVAL_CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        cache_path = self.ARCHIVAL_CACHE_DIR / f"{self.agent_id}.json"
+        tmp_path = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        data = json.dumps({"fetched_at": fetched_at, "texts": texts}).encode("utf-8")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
     def get_persona(self) -> Optional[str]:
         """Get the agent's persona/system prompt."""
         try:
@@ -4,12 +4,44 @@ Local project memory management.
 Stores project-specific memories in .memory/ directory.
 """
 
+import heapq
 import json
 import os
 import re
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import IO, Iterator, Optional
+
+from . import jsonio
+
+_FILENAME_INVALID_RE = re.compile(r"[^a-z0-9\-]")
+# Same character class as _FILENAME_INVALID_RE, restricted to ASCII, for str.translate
+_ASCII_FILENAME_INVALID_TABLE = str.maketrans("", "", "".join(
+    c for c in map(chr, range(128)) if _FILENAME_INVALID_RE.match(c)
+))
+_HYPHEN_RUN_RE = re.compile(r"-+")
+
+
+class _CachedMemory:
+    """A parsed memory file, keyed by the (st_mtime_ns, st_size) it was read at."""
+
+    __slots__ = ("key", "memory", "complete", "_lowered")
+
+    def __init__(self, key: tuple[int, int], memory: dict, complete: bool):
+        self.key = key
+        self.memory = memory
+        self.complete = complete  # False if only a preview was read
+        self._lowered: Optional[tuple[str, str]] = None
+
+    def lowered(self) -> tuple[str, str]:
+        """Lowercased (title, content), computed on first use."""
+        if self._lowered is None:
+            self._lowered = (self.memory["title"].lower(), self.memory["content"].lower())
+        return self._lowered
+
+
+# Parsed memory files by path
+_FILE_CACHE: dict[str, _CachedMemory] = {}
 
 
 class LocalMemory:
@@ -26,6 +58,7 @@ class LocalMemory:
 
     CATEGORIES = ["decisions", "patterns", "learnings"]
     SESSIONS_DIR = "sessions"
+    PREVIEW_BYTES = 8192  # Bytes read per file by preview loads
 
     def __init__(self, project_root: Optional[str] = None):
         """
@@ -36,6 +69,8 @@ class LocalMemory:
         """
         self._root = Path(project_root or os.getcwd())
         self._memory_dir = self._root / ".memory"
+        # Open session log as (path, line-buffered append handle), reused across events
+        self._session_log: Optional[tuple[Path, IO[str]]] = None
 
     @property
     def memory_dir(self) -> Path:
@@ -58,55 +93,93 @@ class LocalMemory:
         if not gitignore.exists():
             gitignore.write_text("sessions/*.session.jsonl\n")
 
-    def load_all(self) -> dict[str, list[dict]]:
+    def load_all(self, preview_only: bool = False, limit: Optional[int] = None) -> dict[str, list[dict]]:
         """
         Load all memories from all categories.
 
+        Args:
+            preview_only: Read only the start of each file (see load_category)
+            limit: Max memories per category (default: all)
+
         Returns:
             Dict with category names as keys and lists of memories as values
         """
         result = {}
         for category in self.CATEGORIES:
-            result[category] = self.load_category(category)
+            result[category] = self.load_category(category, preview_only, limit)
         return result
 
-    def load_category(self, category: str) -> list[dict]:
+    def load_category(self, category: str, preview_only: bool = False, limit: Optional[int] = None) -> list[dict]:
         """
-        Load all memories from a category.
+        Load all memories from a category, in filename order.
 
         Args:
             category: Category name (decisions, patterns, learnings)
+            preview_only: Read only the first PREVIEW_BYTES bytes of each
+                file, so content may be truncated
+            limit: Max memories to load; only the first limit files are read
 
         Returns:
             List of memory dicts with filename, title, and content
         """
+        return [dict(cached.memory) for cached in self._load_cached(category, preview_only, limit)]
+
+    def _load_cached(self, category: str, preview_only: bool = False, limit: Optional[int] = None) -> list[_CachedMemory]:
+        """Load a category's memories through the file cache (see load_category)."""
         if category not in self.CATEGORIES:
             raise ValueError(f"Invalid category: {category}. Must be one of {self.CATEGORIES}")
 
         category_dir = self._memory_dir / category
-        if not category_dir.exists():
+        try:
+            with os.scandir(category_dir) as it:
+                entries = [e for e in it if e.name.endswith(".md") and e.is_file()]
+        except (FileNotFoundError, NotADirectoryError):
             return []
 
+        if limit is None:
+            entries.sort(key=lambda e: e.name)
+        else:
+            entries = heapq.nsmallest(limit, entries, key=lambda e: e.name)
+
         memories = []
-        for file_path in sorted(category_dir.glob("*.md")):
-            content = file_path.read_text()
-            # Extract title from first line if it's a heading
-            title = file_path.stem
-            lines = content.strip().split("\n")
-            if lines and lines[0].startswith("# "):
-                title = lines[0][2:].strip()
-                content = "\n".join(lines[1:]).strip()
-
-            memories.append({
-                "filename": file_path.name,
-                "title": title,
-                "content": content,
-                "category": category,
-                "path": str(file_path),
-            })
+        for entry in entries:
+            # Files are re-read only when their mtime or size changes
+            stat = entry.stat()
+            key = (stat.st_mtime_ns, stat.st_size)
+            cached = _FILE_CACHE.get(entry.path)
+            if cached is None or cached.key != key or not (cached.complete or preview_only):
+                read_limit = self.PREVIEW_BYTES if preview_only else -1
+                complete = read_limit < 0 or stat.st_size <= read_limit
+                cached = _CachedMemory(key, self._parse_memory_file(entry, category, read_limit), complete)
+                _FILE_CACHE[entry.path] = cached
+            memories.append(cached)
 
         return memories
 
+    @staticmethod
+    def _parse_memory_file(entry: os.DirEntry, category: str, limit: int = -1) -> dict:
+        """Read up to limit bytes (-1 for all) of a memory file into a memory dict."""
+        with open(entry.path, "rb") as f:
+            data = f.read(limit)
+        # A preview may end partway through a multi-byte character
+        content = data.decode("utf-8", errors="ignore" if limit >= 0 else "strict")
+        if "\r" in content:
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+        # Extract title from first line if it's a heading
+        title = entry.name[:-3]
+        first_line, _, rest = content.strip().partition("\n")
+        if first_line.startswith("# "):
+            title = first_line[2:].strip()
+            content = rest.strip()
+
+        return {
+            "filename": entry.name,
+            "title": title,
+            "content": content,
+            "category": category,
+            "path": entry.path,
+        }
+
     def save_memory(self, category: str, title: str, content: str) -> Path:
         """
         Save a memory to a category.
@@ -127,28 +200,40 @@ class LocalMemory:
 
         # Create filename from title
         filename = self._title_to_filename(title)
-        file_path = category_dir / f"{filename}.md"
 
-        # Handle filename conflicts
+        # Handle filename conflicts, reading the directory once
+        with os.scandir(category_dir) as it:
+            taken = {e.name for e in it if e.name.startswith(filename)}
+        name = f"{filename}.md"
         counter = 1
-        while file_path.exists():
-            file_path = category_dir / f"{filename}-{counter}.md"
-            counter += 1
-
-        # Write with title header
         file_content = f"# {title}\n\n{content}"
-        file_path.write_text(file_content)
-
-        return file_path
+        while True:
+            while name in taken:
+                name = f"{filename}-{counter}.md"
+                counter += 1
+            file_path = category_dir / name
+
+            # Write with title header; exclusive create so a concurrent
+            # save that took the same name is never overwritten
+            try:
+                with open(file_path, "xb") as f:
+                    f.write(file_content.encode("utf-8"))
+            except FileExistsError:
+                taken.add(name)
+                continue
+            return file_path
 
     def _title_to_filename(self, title: str) -> str:
         """Convert title to valid filename."""
         # Lowercase and replace spaces with hyphens
         filename = title.lower().replace(" ", "-")
         # Remove invalid characters
-        filename = re.sub(r"[^a-z0-9\-]", "", filename)
+        if filename.isascii():
+            filename = filename.translate(_ASCII_FILENAME_INVALID_TABLE)
+        else:
+            filename = _FILENAME_INVALID_RE.sub("", filename)
         # Collapse multiple hyphens
-        filename = re.sub(r"-+", "-", filename)
+        filename = _HYPHEN_RUN_RE.sub("-", filename)
         # Limit length
         return filename[:50].strip("-")
 
@@ -156,7 +241,8 @@ class LocalMemory:
         """
         Search memories by keyword.
 
-        Simple case-insensitive substring matching.
+        Simple case-insensitive substring matching. Lowercased text is cached
+        with each parsed file, so repeated searches do not lowercase it again.
 
         Args:
             query: Search query
@@ -170,11 +256,10 @@ class LocalMemory:
         results = []
 
         for category in categories:
-            memories = self.load_category(category)
-            for memory in memories:
-                if (query_lower in memory["title"].lower() or
-                    query_lower in memory["content"].lower()):
-                    results.append(memory)
+            for cached in self._load_cached(category):
+                title_lower, content_lower = cached.lowered()
+                if query_lower in title_lower or query_lower in content_lower:
+                    results.append(dict(cached.memory))
 
         return results
 
@@ -202,10 +287,12 @@ class LocalMemory:
             event_type: Type of event (e.g., "edit", "write", "bash")
             data: Event data
         """
-        sessions_dir = self._memory_dir / self.SESSIONS_DIR
-        sessions_dir.mkdir(parents=True, exist_ok=True)
-
         log_path = self.get_session_log_path()
+        if self._session_log is None or self._session_log[0] != log_path:
+            # First event, or the date rolled over
+            self.close()
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            self._session_log = (log_path, open(log_path, "a", buffering=1, encoding="utf-8"))
 
         event = {
             "timestamp": datetime.now().isoformat(),
@@ -213,34 +300,49 @@ class LocalMemory:
             **data,
         }
 
-        with open(log_path, "a") as f:
-            f.write(json.dumps(event) + "\n")
+        self._session_log[1].write(jsonio.dumps(event) + "\n")
 
-    def load_session_log(self, date: Optional[datetime] = None) -> list[dict]:
+    def close(self) -> None:
+        """Close the session log handle, if open."""
+        if self._session_log is not None:
+            self._session_log[1].close()
+            self._session_log = None
+
+    def iter_session_log(self, date: Optional[datetime] = None) -> Iterator[dict]:
         """
-        Load session log for a date.
+        Iterate over session log events for a date without loading them all.
 
         Args:
             date: Date to load (default: today)
 
-        Returns:
-            List of session events
+        Yields:
+            Session events, skipping malformed lines
         """
         log_path = self.get_session_log_path(date)
         if not log_path.exists():
-            return []
+            return
 
-        events = []
-        with open(log_path) as f:
+        with open(log_path, "rb") as f:
             for line in f:
-                line = line.strip()
-                if line:
-                    try:
-                        events.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        continue
+                # Both parsers skip surrounding whitespace, so lines are not stripped
+                try:
+                    event = jsonio.loads(line)
+                except json.JSONDecodeError:
+                    # Blank or malformed line
+                    continue
+                yield event
 
-        return events
+    def load_session_log(self, date: Optional[datetime] = None) -> list[dict]:
+        """
+        Load session log for a date.
+
+        Args:
+            date: Date to load (default: today)
+
+        Returns:
+            List of session events
+        """
+        return list(self.iter_session_log(date))
 
     def get_context_summary(self) -> str:
         """
@@ -252,14 +354,15 @@ class LocalMemory:
         if not self.exists:
             return ""
 
-        memories = self.load_all()
+        # The summary shows at most 5 memories per category, 200 characters each
+        memories = self.load_all(preview_only=True, limit=5)
         sections = []
 
         for category in self.CATEGORIES:
             items = memories.get(category, [])
             if items:
                 section = f"## {category.title()}\n"
-                for item in items[:5]:  # Limit to 5 per category
+                for item in items:
                     section += f"- **{item['title']}**: {item['content'][:200]}...\n" if len(item['content']) > 200 else f"- **{item['title']}**: {item['content']}\n"
                 sections.append(section)
 
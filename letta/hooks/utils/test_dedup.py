@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Unit tests for dedup.py
+
+Tests cover:
+- Text normalization and Jaccard similarity
+- DedupIndex duplicate lookups
+- Consistency between DedupIndex and is_duplicate
+- deduplicate_memories and find_similar
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from dedup import (
+    DedupIndex,
+    deduplicate_memories,
+    find_similar,
+    is_duplicate,
+    jaccard_similarity,
+    normalize_text,
+)
+
+
+class TestSimilarity:
+    """Tests for normalization and similarity scoring."""
+
+    def test_normalize_text(self):
+        """Should lowercase, strip punctuation, and collapse whitespace."""
+        assert normalize_text("  Hello,   World!  ").split() == ["hello", "world"]
+
+    def test_jaccard_identical(self):
+        """Identical texts should score 1."""
+        assert jaccard_similarity("use uv for installs", "Use uv for installs.") == 1.0
+
+    def test_jaccard_partial(self):
+        """Should score shared words over total distinct words."""
+        assert jaccard_similarity("a b c", "b c d") == pytest.approx(0.5)
+
+    def test_jaccard_empty(self):
+        """Empty text should score 0."""
+        assert jaccard_similarity("", "anything") == 0.0
+
+
+class TestDedupIndex:
+    """Tests for DedupIndex."""
+
+    def test_find_duplicate(self):
+        """Should return the matching indexed text."""
+        index = DedupIndex(["Always run tests before committing"])
+        assert index.find_duplicate("always run tests before committing!") == "Always run tests before committing"
+
+    def test_find_duplicate_none(self):
+        """Should return None when nothing is similar enough."""
+        index = DedupIndex(["Always run tests before committing"])
+        assert index.find_duplicate("Prefer pathlib over os.path") is None
+
+    def test_add(self):
+        """Added texts should be found by later lookups."""
+        index = DedupIndex()
+        assert len(index) == 0
+        index.add("Cache the database password")
+        assert len(index) == 1
+        assert index.find_duplicate("cache the database password") == "Cache the database password"
+
+    def test_empty_query(self):
+        """Empty text is never a duplicate."""
+        index = DedupIndex(["something"])
+        assert index.find_duplicate("") is None
+
+    def test_threshold(self):
+        """Should respect the configured threshold."""
+        texts = ["a b c d"]
+        assert DedupIndex(texts, threshold=0.7).find_duplicate("a b c e") is None
+        assert DedupIndex(texts, threshold=0.6).find_duplicate("a b c e") == "a b c d"
+
+    def test_same_words_any_order(self):
+        """Texts with the same words should match regardless of order."""
+        index = DedupIndex(["tests before commit", "commit before tests"], threshold=1.0)
+        assert index.find_duplicate("Commit before tests.") == "tests before commit"
+
+    def test_matches_is_duplicate(self):
+        """Should agree with the linear is_duplicate scan."""
+        texts = ["a b c d", "b c d e", "x y z", "a b", ""]
+        index = DedupIndex(texts, threshold=0.5)
+        for query in ["a b c", "c d e", "x y", "q", "a b c d e", ""]:
+            assert index.find_duplicate(query) == is_duplicate(query, texts, threshold=0.5)
+
+
+class TestDeduplicateMemories:
+    """Tests for deduplicate_memories and find_similar."""
+
+    def test_deduplicate_memories(self):
+        """Should keep the first of each group of near-duplicates."""
+        memories = [
+            {"content": "Run the linter before pushing"},
+            {"content": "run the linter before pushing."},
+            {"content": ""},
+            {"content": "Pin dependency versions"},
+        ]
+        result = deduplicate_memories(memories)
+        assert [m["content"] for m in result] == [
+            "Run the linter before pushing",
+            "Pin dependency versions",
+        ]
+
+    def test_deduplicate_memories_content_key(self):
+        """Should read text from the given key."""
+        memories = [{"text": "same words"}, {"text": "Same words!"}]
+        assert len(deduplicate_memories(memories, content_key="text")) == 1
+
+    def test_find_similar(self):
+        """Should return matches above threshold, best first."""
+        texts = ["a b c d", "a b", "x y z"]
+        result = find_similar("a b c", texts, threshold=0.3)
+        assert [text for text, _ in result] == ["a b c d", "a b"]
@@ -10,6 +10,7 @@ Tests cover:
 """
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from textwrap import dedent
 
@@ -115,6 +116,30 @@ class TestFileManagerBasics:
         assert file_path.exists()
         assert file_path.read_text() == "Content"
 
+    def test_write_replaces_atomically(self, temp_file):
+        """Should keep the file's permissions and leave no temporary file."""
+        temp_file.write_text("Original")
+        temp_file.chmod(0o640)
+        fm = FileManager(temp_file)
+        fm.write("Replaced")
+        assert temp_file.read_text() == "Replaced"
+        assert temp_file.stat().st_mode & 0o777 == 0o640
+        assert list(temp_file.parent.iterdir()) == [temp_file]
+
+    def test_concurrent_writes(self, temp_file):
+        """Should not let threads writing the same file clobber each other's temporary file."""
+        contents = [f"writer {i}\n" * 1000 for i in range(4)]
+
+        def write_many(content):
+            fm = FileManager(temp_file)
+            for _ in range(25):
+                fm.write(content)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(write_many, contents))
+        assert temp_file.read_text() in contents
+        assert list(temp_file.parent.iterdir()) == [temp_file]
+
     def test_count_lines(self, markdown_file):
         """Should return correct line count."""
         fm = FileManager(markdown_file)
@@ -126,6 +151,39 @@ class TestFileManagerBasics:
         fm = FileManager(temp_file)
         assert fm.count_lines() == 0
 
+    def test_read_sees_external_changes(self, temp_file):
+        """Should not serve stale content after the file changes on disk."""
+        temp_file.write_text("one")
+        fm = FileManager(temp_file)
+        assert fm.read() == "one"
+        temp_file.write_text("one\ntwo")
+        assert fm.read() == "one\ntwo"
+        assert fm.count_lines() == 2
+
+    def test_read_after_write(self, temp_file):
+        """Should return content written through the manager."""
+        fm = FileManager(temp_file)
+        fm.write("first")
+        assert fm.read() == "first"
+        fm.write("second")
+        assert fm.read() == "second"
+
+    def test_read_after_delete(self, temp_file):
+        """Should raise once the file is removed, even after a cached read."""
+        temp_file.write_text("content")
+        fm = FileManager(temp_file)
+        fm.read()
+        temp_file.unlink()
+        with pytest.raises(FileNotFoundError):
+            fm.read()
+
+    def test_read_translates_line_endings(self, temp_file):
+        """Should read CRLF and CR line endings as LF."""
+        temp_file.write_bytes(b"# A\r\nline 1\rline 2\n")
+        fm = FileManager(temp_file)
+        assert fm.read() == "# A\nline 1\nline 2\n"
+        assert fm.read_lines(2, 3).content == "line 1\nline 2"
+
 
 class TestSectionOperations:
     """Tests for section-based operations."""
@@ -483,6 +541,18 @@ class TestStringOperations:
         assert matches[0] == (1, "foo123")
         assert matches[1] == (3, "foo789")
 
+    def test_find_in_file_repeated_on_line(self, temp_file):
+        """Should report a line once even when it matches several times."""
+        temp_file.write_text("aa aa\nb\naa")
+        fm = FileManager(temp_file)
+        assert fm.find_in_file("aa") == [(1, "aa aa"), (3, "aa")]
+
+    def test_find_in_file_multiline_pattern(self, temp_file):
+        """A pattern containing a newline never matches a single line."""
+        temp_file.write_text("one\ntwo")
+        fm = FileManager(temp_file)
+        assert fm.find_in_file("one\ntwo") == []
+
     def test_find_in_file_no_matches(self, temp_file):
         """Should return empty list when no matches."""
         temp_file.write_text("hello world")
@@ -548,6 +618,15 @@ class TestEdgeCases:
         assert sections[0].heading == "Only Heading"
         assert sections[0].content == ""
 
+    def test_heading_separator(self, temp_file):
+        """Only a space or tab after the #s should start a heading."""
+        temp_file.write_text("#\tTabbed\n#\x0cFeed\n####### Seven\n#NoSpace")
+        fm = FileManager(temp_file)
+
+        sections = fm.list_sections()
+        assert [s.heading for s in sections] == ["Tabbed"]
+        assert sections[0].content == "#\x0cFeed\n####### Seven\n#NoSpace"
+
     def test_consecutive_headings(self, temp_file):
         """Should handle consecutive headings with no content between."""
         temp_file.write_text("# First\n## Second\n### Third\n\nContent here")
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Unit tests for letta_client.py
+
+Tests cover:
+- Loading memory_database from SCAFFOLD_PATH
+- Archival snapshot cache (location, permissions, TTL, malformed files)
+- SSH tunnel start-up locking
+- Secrets Manager password caching
+
+The scaffold's memory_database module is replaced with a stub, so no
+database or SSH tunnel is needed.
+"""
+
+import fcntl
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import letta_client
+from letta_client import LettaClient
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Create a LettaClient backed by a stub memory_database."""
+    stub = SimpleNamespace(get_agent_id=lambda agent_type, project: f"{agent_type}_{project}")
+    monkeypatch.setattr(letta_client, "_memory_database", stub)
+    monkeypatch.setattr(LettaClient, "ARCHIVAL_CACHE_DIR", tmp_path / "cache")
+    # Skip the SSH tunnel and Secrets Manager
+    monkeypatch.setenv("AWS_EXECUTION_ENV", "1")
+    monkeypatch.setenv("PGPASSWORD", "secret")
+    return LettaClient(project="demo")
+
+
+class TestLoadMemoryDatabase:
+    """Tests for _load_memory_database."""
+
+    def test_sibling_imports(self, tmp_path, monkeypatch):
+        """Should let memory_database import modules next to it."""
+        (tmp_path / "letta_test_db_config.py").write_text("PORT = 5433\n")
+        (tmp_path / "memory_database.py").write_text(
+            "import letta_test_db_config\n"
+            "def get_port():\n"
+            "    return letta_test_db_config.PORT\n"
+        )
+        monkeypatch.setattr(letta_client, "SCAFFOLD_PATH", tmp_path)
+        monkeypatch.setattr(letta_client, "_memory_database", None)
+        monkeypatch.setattr(sys, "path", list(sys.path))
+
+        try:
+            module = letta_client._load_memory_database()
+            assert module.get_port() == 5433
+            assert sys.path[-1] == str(tmp_path)
+        finally:
+            sys.modules.pop("memory_database", None)
+            sys.modules.pop("letta_test_db_config", None)
+
+    def test_missing(self, tmp_path, monkeypatch):
+        """Should raise ImportError when SCAFFOLD_PATH has no memory_database.py."""
+        monkeypatch.setattr(letta_client, "SCAFFOLD_PATH", tmp_path)
+        monkeypatch.setattr(letta_client, "_memory_database", None)
+        with pytest.raises(ImportError):
+            letta_client._load_memory_database()
+
+
+class TestArchivalCache:
+    """Tests for load_archival_cache and save_archival_cache."""
+
+    def test_round_trip(self, client):
+        """Should load a snapshot saved for the same agent."""
+        now = time.time()
+        client.save_archival_cache(["a", "b"], now)
+        assert client.load_archival_cache(60) == {"fetched_at": now, "texts": ["a", "b"]}
+
+    def test_private_file_outside_project(self, client):
+        """Should write a user-only file named after the agent."""
+        client.save_archival_cache(["a"], time.time())
+        cache_dir = LettaClient.ARCHIVAL_CACHE_DIR
+        assert [p.name for p in cache_dir.iterdir()] == ["project_assistant_demo.json"]
+        assert cache_dir.stat().st_mode & 0o777 == 0o700
+        assert (cache_dir / "project_assistant_demo.json").stat().st_mode & 0o777 == 0o600
+
+    def test_missing(self, client):
+        """Should return None when nothing is cached."""
+        assert client.load_archival_cache(60) is None
+
+    def test_stale(self, client):
+        """Should return None once the snapshot is older than max_age."""
+        client.save_archival_cache(["a"], time.time() - 120)
+        assert client.load_archival_cache(60) is None
+        assert client.load_archival_cache(300) is not None
+
+    @pytest.mark.parametrize("content", [
+        "not json",
+        "[]",
+        json.dumps({"texts": ["a"]}),
+        json.dumps({"fetched_at": "yesterday", "texts": ["a"]}),
+        json.dumps({"fetched_at": 0, "texts": "a"}),
+    ])
+    def test_malformed(self, client, content):
+        """Should return None for unreadable or malformed snapshots."""
+        cache_dir = LettaClient.ARCHIVAL_CACHE_DIR
+        cache_dir.mkdir()
+        (cache_dir / "project_assistant_demo.json").write_text(content)
+        assert client.load_archival_cache(float("inf")) is None
+
+
+class TestPassword:
+    """Tests for _get_password."""
+
+    @pytest.fixture
+    def secrets(self, client, monkeypatch):
+        """Serve passwords from a list instead of Secrets Manager; returns one entry per fetch."""
+        passwords = iter(["first", "second"])
+        fetches = []
+
+        def fetch_secret(self):
+            fetches.append(1)
+            return {"password": next(passwords)}
+
+        monkeypatch.setattr(LettaClient, "_fetch_secret", fetch_secret)
+        monkeypatch.setattr(LettaClient, "_password_cache", {})
+        monkeypatch.setattr(LettaClient, "_exported_password", None)
+        monkeypatch.delenv("PGPASSWORD")
+        monkeypatch.delenv("DB_PASSWORD", raising=False)
+        return fetches
+
+    def test_user_password_wins(self, client, secrets, monkeypatch):
+        """Should use a PGPASSWORD the user set without fetching."""
+        monkeypatch.setenv("PGPASSWORD", "mine")
+        assert client._get_password() == "mine"
+        assert secrets == []
+
+    def test_cached_within_ttl(self, client, secrets):
+        """Should fetch once, export the password, and reuse it."""
+        assert client._get_password() == "first"
+        assert client._get_password() == "first"
+        assert os.environ["PGPASSWORD"] == "first"
+        assert len(secrets) == 1
+
+    def test_refetched_after_ttl(self, client, secrets, monkeypatch):
+        """Should refetch an exported password once it expires."""
+        monkeypatch.setattr(LettaClient, "PASSWORD_TTL", 0)
+        assert client._get_password() == "first"
+        assert client._get_password() == "second"
+        assert os.environ["PGPASSWORD"] == "second"
+
+    def test_failed_fetch_retried_by_queries(self, client, secrets, monkeypatch):
+        """Should retry a failed fetch before the next database call."""
+        def unavailable(self):
+            raise RuntimeError("Secrets Manager unavailable")
+
+        with monkeypatch.context() as m:
+            m.setattr(LettaClient, "_fetch_secret", unavailable)
+            assert client._get_password() == ""
+        assert "PGPASSWORD" not in os.environ
+
+        letta_client._memory_database.list_memories_db = lambda *args, **kwargs: []
+        assert client.list_archival() == []
+        assert os.environ["PGPASSWORD"] == "first"
+
+    def test_db_password_exported(self, client, secrets, monkeypatch):
+        """Should export DB_PASSWORD as PGPASSWORD for database calls."""
+        monkeypatch.setenv("DB_PASSWORD", "dbpw")
+        seen = []
+        monkeypatch.setattr(client, "_db", SimpleNamespace(
+            get_db_connection=lambda: seen.append(os.environ.get("PGPASSWORD")),
+        ))
+        client._get_connection()
+        assert seen == ["dbpw"]
+        assert secrets == []
+
+
+class TestTunnel:
+    """Tests for _ensure_tunnel."""
+
+    def test_lock_wait_is_bounded(self, client, tmp_path, monkeypatch):
+        """Should give up instead of blocking while another hook holds the lock."""
+        calls = []
+        monkeypatch.setattr(LettaClient, "_tunnel_up", staticmethod(lambda: False))
+        monkeypatch.setattr(LettaClient, "TUNNEL_LOCK_FILE", tmp_path / "tunnel.lock")
+        # Leaves a deadline of a fraction of a second
+        monkeypatch.setattr(LettaClient, "TUNNEL_START_TIMEOUT", -4.8)
+        monkeypatch.setattr(subprocess, "run", lambda *args, **kwargs: calls.append(args))
+
+        with open(tmp_path / "tunnel.lock", "w") as holder:
+            fcntl.flock(holder, fcntl.LOCK_EX)
+            client._ensure_tunnel()
+        assert calls == []
+
+        monkeypatch.setattr(time, "sleep", lambda seconds: None)
+        client._ensure_tunnel()
+        assert len(calls) == 1
+        assert "ControlPersist=yes" in calls[0][0]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
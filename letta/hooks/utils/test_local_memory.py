@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Unit tests for local_memory.py
+
+Tests cover:
+- Loading memories, with limits and previews
+- Reuse and invalidation of parsed memory files
+- Filename conflicts in save_memory
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# local_memory uses package-relative imports, so import it through utils
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import local_memory
+from utils.local_memory import LocalMemory
+
+
+@pytest.fixture
+def local(tmp_path):
+    """Create an initialized LocalMemory in a temporary project."""
+    memory = LocalMemory(str(tmp_path))
+    memory.initialize()
+    return memory
+
+
+@pytest.fixture
+def parse_count(monkeypatch):
+    """Count memory files parsed from disk."""
+    calls = []
+    parse = LocalMemory._parse_memory_file
+
+    def counting_parse(entry, category, limit=-1):
+        calls.append((entry.name, limit))
+        return parse(entry, category, limit)
+
+    monkeypatch.setattr(LocalMemory, "_parse_memory_file", staticmethod(counting_parse))
+    return calls
+
+
+class TestLoading:
+    """Tests for load_category and load_all."""
+
+    def test_load_category(self, local):
+        """Should parse the title heading and content of each file."""
+        local.save_memory("patterns", "Use pathlib", "Prefer Path over os.path.")
+        [memory] = local.load_category("patterns")
+        assert memory["title"] == "Use pathlib"
+        assert memory["content"] == "Prefer Path over os.path."
+        assert memory["filename"] == "use-pathlib.md"
+        assert memory["category"] == "patterns"
+
+    def test_invalid_category(self, local):
+        """Should reject unknown categories."""
+        with pytest.raises(ValueError):
+            local.load_category("notes")
+
+    def test_missing_directory(self, tmp_path):
+        """Should return nothing before .memory/ exists."""
+        assert LocalMemory(str(tmp_path)).load_category("decisions") == []
+
+    def test_limit(self, local):
+        """Should load only the first limit files by name."""
+        for title in ["charlie", "alpha", "bravo"]:
+            local.save_memory("learnings", title, "text")
+        assert [m["title"] for m in local.load_category("learnings")] == ["alpha", "bravo", "charlie"]
+        assert [m["title"] for m in local.load_category("learnings", limit=2)] == ["alpha", "bravo"]
+        assert [len(memories) for memories in local.load_all(limit=1).values()] == [0, 0, 1]
+
+    def test_preview_only(self, local):
+        """Should read only the first PREVIEW_BYTES of a file."""
+        local.save_memory("decisions", "Big", "x" * (LocalMemory.PREVIEW_BYTES * 2))
+        [preview] = local.load_category("decisions", preview_only=True)
+        assert len(preview["content"]) < LocalMemory.PREVIEW_BYTES
+        [full] = local.load_category("decisions")
+        assert len(full["content"]) == LocalMemory.PREVIEW_BYTES * 2
+
+    def test_returns_copies(self, local):
+        """Should not let callers modify cached memories."""
+        local.save_memory("decisions", "Title", "content")
+        local.load_category("decisions")[0]["content"] = "changed"
+        assert local.load_category("decisions")[0]["content"] == "content"
+
+
+class TestFileCache:
+    """Tests for reuse of parsed memory files."""
+
+    def test_unchanged_file_reused(self, local, parse_count):
+        """Should parse an unchanged file only once."""
+        local.save_memory("patterns", "Title", "content")
+        local.load_category("patterns")
+        local.load_category("patterns")
+        local.search("content")
+        assert len(parse_count) == 1
+
+    def test_size_change_rereads(self, local):
+        """Should reread a file whose size changed."""
+        path = local.save_memory("patterns", "Title", "old")
+        local.load_category("patterns")
+        path.write_text("# Title\n\nnewer")
+        assert local.load_category("patterns")[0]["content"] == "newer"
+
+    def test_mtime_change_rereads(self, local):
+        """Should reread a same-size file whose mtime changed."""
+        path = local.save_memory("patterns", "Title", "old")
+        local.load_category("patterns")
+        mtime_ns = path.stat().st_mtime_ns
+        path.write_text("# Title\n\nnew")
+        os.utime(path, ns=(mtime_ns + 1_000_000, mtime_ns + 1_000_000))
+        assert local.load_category("patterns")[0]["content"] == "new"
+
+    def test_preview_upgraded_to_full_read(self, local, parse_count):
+        """Should reread a truncated preview for a full load, then reuse it for previews."""
+        local.save_memory("decisions", "Big", "x" * (LocalMemory.PREVIEW_BYTES * 2))
+        local.load_category("decisions", preview_only=True)
+        local.load_category("decisions")
+        local.load_category("decisions", preview_only=True)
+        assert [limit for _, limit in parse_count] == [LocalMemory.PREVIEW_BYTES, -1]
+
+    def test_small_preview_is_complete(self, local, parse_count):
+        """Should reuse a preview that already holds the whole file."""
+        local.save_memory("decisions", "Small", "short")
+        local.load_category("decisions", preview_only=True)
+        local.load_category("decisions")
+        assert len(parse_count) == 1
+
+
+class TestSaveMemory:
+    """Tests for save_memory."""
+
+    def test_filename_conflict(self, local):
+        """Should number files whose titles map to the same name."""
+        first = local.save_memory("learnings", "Same Title", "one")
+        second = local.save_memory("learnings", "same title!", "two")
+        assert (first.name, second.name) == ("same-title.md", "same-title-1.md")
+
+    def test_racing_save_not_overwritten(self, local, tmp_path, monkeypatch):
+        """Should pick another name when a file appears after the directory scan."""
+        empty_dir = tmp_path / "empty"
+        empty_dir.mkdir()
+        category_dir = local.memory_dir / "learnings"
+        real_scandir = os.scandir
+
+        def racing_scandir(path):
+            # Another save creates the file once this one has listed the directory
+            (category_dir / "title.md").write_text("# Title\n\nother")
+            return real_scandir(empty_dir)
+
+        monkeypatch.setattr(local_memory.os, "scandir", racing_scandir)
+        path = local.save_memory("learnings", "Title", "mine")
+        monkeypatch.undo()
+
+        assert path.name == "title-1.md"
+        assert (category_dir / "title.md").read_text() == "# Title\n\nother"
+        assert path.read_text() == "# Title\n\nmine"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -81,6 +81,7 @@ cp "$SCRIPT_DIR/hooks/utils/__init__.py" "$HOOKS_DIR/utils/"
 cp "$SCRIPT_DIR/hooks/utils/letta_client.py" "$HOOKS_DIR/utils/"
 cp "$SCRIPT_DIR/hooks/utils/local_memory.py" "$HOOKS_DIR/utils/"
 cp "$SCRIPT_DIR/hooks/utils/dedup.py" "$HOOKS_DIR/utils/"
+cp "$SCRIPT_DIR/hooks/utils/jsonio.py" "$HOOKS_DIR/utils/"
 
 # Make scripts executable
 chmod +x "$HOOKS_DIR/"*.py
@@ -1,6 +1,12 @@
 """Letta tool for invoking the AWS CLI via subprocess."""
 
+import hashlib
+import os
+import shlex
 import subprocess
+import threading
+import time
+from pathlib import Path
 
 
 def call_aws(
@@ -9,20 +15,42 @@ def call_aws(
     profile: str = "",
     output_format: str = "json",
     timeout: int = 60,
+    cache_ttl: int = 0,
 ) -> str:
     """Call the AWS CLI with a command and return the response.
 
     Args:
         command: The AWS CLI command (e.g. "s3 ls", "ec2 describe-instances").
+            Arguments are split with shell quoting rules; pipes and other shell
+            operators are not supported.
         region: Optional AWS region override (e.g. "us-west-2").
         profile: Optional AWS CLI profile name.
         output_format: Output format - "json", "text", or "table". Defaults to "json".
         timeout: Subprocess timeout in seconds. Defaults to 60.
+        cache_ttl: Seconds to reuse the output of an identical earlier successful
+            call. 0 (the default) disables caching. Only read-only operations
+            (describe-*, list-*, get-*, s3 ls) are cached, and never ones that
+            return secrets or credentials; other commands always run.
 
     Returns:
         The AWS CLI output, or an error message string on failure.
     """
-    cmd = ["aws"] + command.split()
+    try:
+        args = shlex.split(command)
+        # No shell runs the command, so pipes, redirects and command lists
+        # would reach the AWS CLI as literal arguments; quoted ones are kept
+        lexer = shlex.shlex(command, punctuation_chars=True)
+        lexer.whitespace_split = True
+        operators = [token for token in lexer if set(token) <= set("|&;<>()")]
+    except ValueError as e:
+        return f"Error: could not parse AWS CLI command: {e}"
+    if operators:
+        return (
+            f"Error: shell operator {operators[0]!r} is not supported; "
+            "pass a single AWS CLI command (quote arguments that contain it)."
+        )
+
+    cmd = ["aws", *args]
 
     if region:
         cmd.extend(["--region", region])
@@ -32,11 +60,44 @@ def call_aws(
 
     cmd.extend(["--output", output_format])
 
+    # Only read-only operations are cached, so a repeated change always runs;
+    # s3api get-object also writes a file, which a cached call would skip
+    operation = args[1] if len(args) > 1 else ""
+    read_only = args[:2] == ["s3", "ls"] or (
+        operation.startswith(("describe-", "list-", "get-"))
+        and operation not in ("get-object", "get-object-torrent")
+    )
+    # Secrets and credentials are never written to the cache
+    returns_secret = operation.startswith(
+        ("assume-role", "get-credentials", "get-login", "get-parameter")
+    ) or any(word in operation for word in ("secret", "credential", "password", "token"))
+
+    cache_file = None
+    if cache_ttl > 0 and read_only and not returns_secret:
+        key = hashlib.blake2b(digest_size=16)
+        # The account, profile, region and endpoint may also come from the environment
+        env_names = (
+            "AWS_PROFILE", "AWS_REGION", "AWS_DEFAULT_REGION",
+            "AWS_ACCESS_KEY_ID", "AWS_SESSION_TOKEN",
+            "AWS_CONFIG_FILE", "AWS_SHARED_CREDENTIALS_FILE",
+            "AWS_ENDPOINT_URL",
+        )
+        for part in (*cmd, *(os.environ.get(name, "") for name in env_names)):
+            key.update(part.encode() + b"\0")
+        cache_file = Path.home() / ".cache" / "sharedskills" / "aws" / f"{key.hexdigest()}.txt"
+        try:
+            if time.time() - cache_file.stat().st_mtime < cache_ttl:
+                return cache_file.read_text(encoding="utf-8")
+            # Expired entries are removed rather than left on disk
+            cache_file.unlink()
+        except OSError:
+            pass
+
     try:
         result = subprocess.run(
             cmd,
+            stdin=subprocess.DEVNULL,
             capture_output=True,
-            text=True,
             timeout=timeout,
         )
     except subprocess.TimeoutExpired:
@@ -45,7 +106,29 @@ def call_aws(
         return "Error: aws binary not found. Ensure the AWS CLI is installed and on PATH."
 
     if result.returncode != 0:
-        stderr = result.stderr.strip()
+        stderr = result.stderr.decode("utf-8", errors="replace").strip()
         return f"Error: AWS CLI exited with code {result.returncode}. stderr: {stderr}"
 
-    return result.stdout
+    # Decode once as UTF-8, without text mode's newline translation
+    output = result.stdout.decode("utf-8", errors="replace")
+
+    if cache_file is not None:
+        try:
+            # Responses may hold secrets, so only the current user can read them
+            for cache_dir in (cache_file.parent.parent, cache_file.parent):
+                cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+                os.chmod(cache_dir, 0o700)
+            # Unique per thread, so concurrent calls never share a temporary file
+            tmp_file = cache_file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(output.encode("utf-8"))
+                os.replace(tmp_file, cache_file)
+            except BaseException:
+                tmp_file.unlink(missing_ok=True)
+                raise
+        except OSError:
+            pass
+
+    return output
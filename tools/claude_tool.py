@@ -1,6 +1,11 @@
 """Letta tool for invoking the Claude CLI (Claude Code) via subprocess."""
 
+import hashlib
+import os
 import subprocess
+import threading
+import time
+from pathlib import Path
 
 
 def call_claude(
@@ -12,6 +17,7 @@ def call_claude(
     max_turns: int = 0,
     timeout: int = 120,
     output_format: str = "text",
+    cache_ttl: int = 0,
 ) -> str:
     """Call the Claude CLI with a prompt and return the response.
 
@@ -24,6 +30,9 @@ def call_claude(
         max_turns: Max agentic turns. 0 means unlimited.
         timeout: Subprocess timeout in seconds. Defaults to 120.
         output_format: Output format - "text" or "json". Defaults to "text".
+        cache_ttl: Seconds to reuse the response to an identical earlier successful
+            call. 0 (the default) disables caching. Only use it for read-only
+            prompts: a cached call does not run Claude, so it makes no changes.
 
     Returns:
         Claude's text response, or an error message string on failure.
@@ -42,12 +51,25 @@ def call_claude(
     if output_format == "json":
         cmd.extend(["--output-format", "json"])
 
+    cache_file = None
+    if cache_ttl > 0:
+        key = hashlib.blake2b(digest_size=16)
+        for part in (*cmd, prompt, os.path.abspath(working_directory or os.getcwd())):
+            key.update(part.encode() + b"\0")
+        cache_file = Path.home() / ".cache" / "sharedskills" / "claude" / f"{key.hexdigest()}.txt"
+        try:
+            if time.time() - cache_file.stat().st_mtime < cache_ttl:
+                return cache_file.read_text(encoding="utf-8")
+            # Expired entries are removed rather than left on disk
+            cache_file.unlink()
+        except OSError:
+            pass
+
     try:
         result = subprocess.run(
             cmd,
-            input=prompt,
+            input=prompt.encode("utf-8"),
             capture_output=True,
-            text=True,
             timeout=timeout,
             cwd=working_directory or None,
         )
@@ -57,7 +79,29 @@ def call_claude(
         return "Error: claude binary not found. Ensure Claude Code is installed and on PATH."
 
     if result.returncode != 0:
-        stderr = result.stderr.strip()
+        stderr = result.stderr.decode("utf-8", errors="replace").strip()
         return f"Error: Claude CLI exited with code {result.returncode}. stderr: {stderr}"
 
-    return result.stdout
+    # Decode once as UTF-8, without text mode's newline translation
+    output = result.stdout.decode("utf-8", errors="replace")
+
+    if cache_file is not None:
+        try:
+            # Responses may hold secrets, so only the current user can read them
+            for cache_dir in (cache_file.parent.parent, cache_file.parent):
+                cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+                os.chmod(cache_dir, 0o700)
+            # Unique per thread, so concurrent calls never share a temporary file
+            tmp_file = cache_file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(output.encode("utf-8"))
+                os.replace(tmp_file, cache_file)
+            except BaseException:
+                tmp_file.unlink(missing_ok=True)
+                raise
+        except OSError:
+            pass
+
+    return output